@@ -1,24 +1,26 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import http_fetch
+from web_crawler import Crawler
+from dom_extractor import DEFAULT_PARSER, make_soup, extract_single_pass
+from entity_extractor import extract_entities, strip_html
+from stream_export import export_records, iter_records
+from scrape_scheduler import ScrapeScheduler, SCRAPE_OPTIONS
+from driver_pool import DriverPool, fetch_rendered
 import pandas as pd
 import json
-import re
-import base64
 from datetime import datetime
-import time
 import logging
-import schedule
 import smtplib
 from email.mime.text import MIMEText
 import sqlite3
+import os
 from urllib.parse import urlparse
-import io
+
+@st.cache_resource
+def get_driver_pool():
+    # Warm browsers survive Streamlit reruns instead of launching per scrape
+    return DriverPool(size=2, max_pages=50)
+
 
 class WebScraperEditor:
     def __init__(self):
@@ -49,6 +51,17 @@ class WebScraperEditor:
         # Sidebar configuration
         st.sidebar.title("Configuration")
         self.theme = st.sidebar.selectbox("Theme", ["Light", "Dark"])
+        parsers = ["lxml", "html.parser"]
+        self.parser = st.sidebar.selectbox("HTML Parser", parsers,
+                                           index=parsers.index(DEFAULT_PARSER))
+
+        # Conditional-request cache statistics
+        cache_stats = http_fetch.get_cache().stats()
+        st.sidebar.subheader("HTTP Cache")
+        st.sidebar.write(f"Hits: {cache_stats['hits']} | Misses: {cache_stats['misses']}")
+        st.sidebar.write(f"Bytes saved: {cache_stats['bytes_saved'] / 1024:.1f} KB")
+        st.sidebar.write(f"Cached pages: {cache_stats['entries']} "
+                         f"({cache_stats['size'] / 1024 / 1024:.1f} MB)")
         
         # Main input section
         self.url = st.text_input("Target Website URL")
@@ -61,6 +74,9 @@ class WebScraperEditor:
         with col3:
             self.custom_headers = st.checkbox("Use Custom Headers")
 
+        if self.use_selenium:
+            self.wait_selector = st.text_input("Wait for CSS selector (blank = wait for DOM to settle)")
+
         if self.custom_headers:
             self.headers = st.text_area("Custom Headers (JSON format)", 
                                       '{"User-Agent": "Mozilla/5.0"}')
@@ -68,6 +84,20 @@ class WebScraperEditor:
         if self.method == "POST":
             self.post_data = st.text_area("POST Data (JSON format)", "{}")
 
+        # Crawl mode options
+        self.crawl_mode = st.checkbox("Crawl Mode (follow links from this URL)")
+        if self.crawl_mode:
+            col1, col2 = st.columns(2)
+            with col1:
+                self.crawl_include = st.text_input("Include URL patterns (regex, comma separated)")
+                self.crawl_exclude = st.text_input("Exclude URL patterns (regex, comma separated)")
+                self.crawl_same_domain = st.checkbox("Stay on seed domain", value=True)
+            with col2:
+                self.crawl_depth = st.number_input("Max Depth", min_value=0, max_value=10, value=2)
+                self.crawl_pages = st.number_input("Page Budget", min_value=1, max_value=10000, value=50)
+                self.crawl_concurrency = st.number_input("Concurrency", min_value=1, max_value=64, value=8)
+                self.crawl_delay = st.number_input("Politeness Delay (seconds)", min_value=0.0, value=1.0)
+
         # Scraping options
         st.subheader("Scraping Options")
         self.scraping_options = st.multiselect(
@@ -99,14 +129,28 @@ class WebScraperEditor:
             if st.button("Generate Code"):
                 self.generate_code()
         with col3:
+            # A nested button would be False again on the rerun its own click causes,
+            # so the form's visibility is kept in session state
             if st.button("Schedule Job"):
-                self.schedule_job()
+                st.session_state.show_schedule = True
+        if st.session_state.get('show_schedule'):
+            self.schedule_job()
+
+        # Results outlive the "Scrape Data" rerun so the export button can act on them
+        if 'scraped_data' in st.session_state:
+            self.display_results(st.session_state.scraped_data)
 
     def scrape_website(self):
         try:
             st.info("Starting scraping process...")
             progress_bar = st.progress(0)
 
+            if self.crawl_mode:
+                self.crawl_website()
+                progress_bar.progress(100)
+                self.save_to_history(self.url, "Success")
+                return
+
             if self.use_selenium:
                 data = self.scrape_with_selenium()
             else:
@@ -119,8 +163,8 @@ class WebScraperEditor:
             
             progress_bar.progress(75)
             
-            # Display results
-            self.display_results(data)
+            # Kept for display and export on later reruns
+            st.session_state.scraped_data = data
             
             progress_bar.progress(100)
             st.success("Scraping completed successfully!")
@@ -133,48 +177,64 @@ class WebScraperEditor:
             self.logger.error(f"Scraping error: {str(e)}")
             self.save_to_history(self.url, "Failed")
 
-    def scrape_with_requests(self):
-        headers = json.loads(self.headers) if self.custom_headers else {
+    def request_headers(self):
+        return json.loads(self.headers) if self.custom_headers else {
             "User-Agent": "Mozilla/5.0"
         }
+
+    def scrape_with_requests(self):
+        headers = self.request_headers()
         
         if self.method == "GET":
-            response = requests.get(self.url, headers=headers)
+            response = http_fetch.get(self.url, use_cache=True, headers=headers)
         else:
             post_data = json.loads(self.post_data)
-            response = requests.post(self.url, headers=headers, data=post_data)
+            response = http_fetch.post(self.url, headers=headers, data=post_data)
             
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, self.parser)
         return self.extract_data(soup)
 
+    def crawl_website(self):
+        split = lambda text: [p.strip() for p in text.split(',') if p.strip()]
+        output_path = f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+        crawler = Crawler(
+            self.url,
+            lambda soup: self.transform_data(self.extract_data(soup)),
+            output_path,
+            include=split(self.crawl_include),
+            exclude=split(self.crawl_exclude),
+            max_depth=int(self.crawl_depth),
+            max_pages=int(self.crawl_pages),
+            concurrency=int(self.crawl_concurrency),
+            delay=float(self.crawl_delay),
+            same_domain=self.crawl_same_domain,
+            headers=self.request_headers(),
+            parser=self.parser
+        )
+        stats = crawler.crawl()
+
+        st.success(f"Crawled {stats['pages']} pages in {stats['seconds']:.1f}s "
+                   f"({stats['failed']} failed)")
+        st.write(f"Results streamed to `{output_path}`")
+        with open(output_path, 'r', encoding='utf-8') as f:
+            preview = [json.loads(line) for _, line in zip(range(5), f)]
+        st.json(preview)
+
     def scrape_with_selenium(self):
-        options = Options()
-        options.headless = True
-        driver = webdriver.Chrome(options=options)
-        
-        try:
-            driver.get(self.url)
-            time.sleep(2)  # Wait for JavaScript to load
-            html = driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
-            return self.extract_data(soup)
-        finally:
-            driver.quit()
+        html = fetch_rendered(get_driver_pool(), self.url, self.wait_selector or None)
+        soup = make_soup(html, self.parser)
+        return self.extract_data(soup)
 
     def extract_data(self, soup):
-        data = {}
-        
-        if "Tables" in self.scraping_options:
-            data['tables'] = pd.read_html(str(soup))
-            
-        if "Links" in self.scraping_options:
-            data['links'] = [a.get('href') for a in soup.find_all('a')]
-            
-        if "Images" in self.scraping_options:
-            data['images'] = [img.get('src') for img in soup.find_all('img')]
-            
-        if "Text" in self.scraping_options:
-            data['text'] = soup.get_text()
+        # One walk over the tree fills every selected bucket
+        data = extract_single_pass(
+            soup,
+            tables="Tables" in self.scraping_options,
+            links="Links" in self.scraping_options,
+            images="Images" in self.scraping_options,
+            text="Text" in self.scraping_options
+        )
             
         if "Custom Selector" in self.scraping_options:
             if self.selector_type == "CSS":
@@ -192,16 +252,22 @@ class WebScraperEditor:
         for key in data:
             if isinstance(data[key], str):
                 if "Remove HTML" in self.transformations:
-                    data[key] = re.sub('<[^<]+?>', '', data[key])
+                    data[key] = strip_html(data[key])
                     
                 if "Convert to Lowercase" in self.transformations:
                     data[key] = data[key].lower()
                     
+                # Emails and phone numbers come out of a single scan
+                kinds = []
                 if "Extract Emails" in self.transformations:
-                    data[key] = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', data[key])
-                    
+                    kinds.append('email')
                 if "Extract Phone Numbers" in self.transformations:
-                    data[key] = re.findall(r'\+?\d{1,4}?[-.\s]?\(?\d{1,3}?\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}', data[key])
+                    kinds.append('phone')
+                if len(kinds) == 1:
+                    data[key] = extract_entities(data[key], kinds)[kinds[0]]
+                elif kinds:
+                    entities = extract_entities(data[key], kinds)
+                    data[key] = {'emails': entities['email'], 'phones': entities['phone']}
                     
             elif isinstance(data[key], list):
                 if "Remove Duplicates" in self.transformations:
@@ -231,34 +297,28 @@ class WebScraperEditor:
                 st.write(value)
 
         # Export options
-        export_format = st.selectbox("Export Format", ["CSV", "JSON", "Excel"])
+        export_format = st.selectbox("Export Format", ["CSV", "JSONL", "Parquet", "Excel"])
         if st.button("Export Data"):
             self.export_data(data, export_format)
 
     def export_data(self, data, format_type):
+        formats = {
+            "CSV": ('csv', 'text/csv'),
+            "JSONL": ('jsonl', 'application/x-ndjson'),
+            "Parquet": ('parquet', 'application/octet-stream'),
+            "Excel": ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        }
         try:
-            if format_type == "CSV":
-                df = pd.DataFrame(data)
-                csv = df.to_csv(index=False)
-                b64 = base64.b64encode(csv.encode()).decode()
-                href = f'<a href="data:file/csv;base64,{b64}" download="scraped_data.csv">Download CSV</a>'
-                st.markdown(href, unsafe_allow_html=True)
-            elif format_type == "JSON":
-                json_str = json.dumps(data, indent=2)
-                b64 = base64.b64encode(json_str.encode()).decode()
-                href = f'<a href="data:file/json;base64,{b64}" download="scraped_data.json">Download JSON</a>'
-                st.markdown(href, unsafe_allow_html=True)
-            elif format_type == "Excel":
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                    for key, value in data.items():
-                        if isinstance(value, list):
-                            pd.DataFrame(value).to_excel(writer, sheet_name=key)
-                        elif isinstance(value, pd.DataFrame):
-                            value.to_excel(writer, sheet_name=key)
-                b64 = base64.b64encode(output.getvalue()).decode()
-                href = f'<a href="data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}" download="scraped_data.xlsx">Download Excel</a>'
-                st.markdown(href, unsafe_allow_html=True)
+            extension, mime = formats[format_type]
+            path = os.path.join('exports',
+                                f"scraped_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}")
+
+            # Rows are written to disk as they are produced, then served from the file
+            count = export_records(iter_records(data), path, extension)
+            st.write(f"Exported {count} rows to `{path}`")
+            with open(path, 'rb') as f:
+                st.download_button(f"Download {format_type}", f,
+                                   file_name=os.path.basename(path), mime=mime)
         except Exception as e:
             st.error(f"Export failed: {str(e)}")
 
@@ -297,26 +357,23 @@ data = {{}}
     def schedule_job(self):
         st.subheader("Schedule Scraping Job")
         
-        schedule_time = st.time_input("Select time for daily scraping")
-        email = st.text_input("Email for notifications")
+        with st.form("schedule_form"):
+            schedule_time = st.time_input("Select time for daily scraping")
+            email = st.text_input("Email for notifications")
+            confirmed = st.form_submit_button("Confirm Schedule")
         
-        if st.button("Confirm Schedule"):
-            schedule.every().day.at(schedule_time.strftime("%H:%M")).do(
-                self.scheduled_scraping, email)
-            st.success(f"Scraping scheduled for {schedule_time} daily!")
-
-    def scheduled_scraping(self, email):
-        try:
-            data = self.scrape_with_requests()
-            if email:
-                self.send_email_notification(email, "Scraping completed successfully!")
-        except Exception as e:
-            if email:
-                self.send_email_notification(email, f"Scraping failed: {str(e)}")
+        if confirmed:
+            # Jobs live in scraper_history.db and are run by `python scrape_scheduler.py run`
+            options = [o for o in self.scraping_options if o in SCRAPE_OPTIONS]
+            job_id = ScrapeScheduler().add_job(
+                self.url, options, daily_at=schedule_time.strftime("%H:%M"),
+                email=email or None, headers=self.request_headers())
+            st.success(f"Job #{job_id} scheduled for {schedule_time} daily!")
+            st.info("Start the scheduler with: python scrape_scheduler.py run")
 
-    def send_email_notification(self, email, message):
-        # Implementation depends on your email service configuration
-        pass
+        jobs = ScrapeScheduler().list_jobs()
+        if jobs:
+            st.dataframe(pd.DataFrame(jobs)[['id', 'url', 'daily_at', 'every_minutes', 'next_run']])
 
     def save_to_history(self, url, status):
         conn = sqlite3.connect('scraper_history.db')
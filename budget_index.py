@@ -0,0 +1,190 @@
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from itertools import count
+
+TOKEN_RE = re.compile(r'\w+')
+AMOUNT_RE = re.compile(r'^amount(>=|<=|>|<|=|:)(-?\d+(?:\.\d+)?)$')
+FIELD_RE = re.compile(r'^(category|type):(.+)$')
+
+
+def tokenize(text):
+    return set(TOKEN_RE.findall(str(text).lower()))
+
+
+class TransactionIndex:
+    def __init__(self, transactions=()):
+        self.uids = count()
+        self.items = {}     # uid -> transaction
+        self.entries = {}   # id(transaction) -> (date, uid, type, category, amount, tokens)
+        self.dates = []     # sorted (date, uid)
+        self.amounts = []   # sorted (amount, uid)
+        self.monthly = defaultdict(float)        # (month, type) -> total
+        self.monthly_category = defaultdict(float)  # (month, type, category) -> total
+        self.month_breakdown = defaultdict(dict)    # month -> {(type, category): [total, count]}
+        self.postings = defaultdict(set)    # description/category token -> uids
+        self.fields = defaultdict(set)      # ("category"|"type", value) -> uids
+        self.vocabulary = []                # sorted tokens, for prefix lookups
+
+        for transaction in transactions:
+            self.track(transaction)
+        self.dates.sort()
+        self.amounts.sort()
+        self.vocabulary = sorted(self.postings)
+
+    def track(self, transaction):
+        uid = next(self.uids)
+        tokens = tokenize(transaction["description"]) | tokenize(transaction["category"])
+        entry = (transaction["date"], uid, transaction["type"],
+                 transaction["category"], float(transaction["amount"]), tokens)
+        self.items[uid] = transaction
+        self.entries[id(transaction)] = entry
+        self.dates.append((entry[0], uid))
+        self.amounts.append((entry[4], uid))
+        self.adjust(entry, 1)
+        new_tokens = [token for token in tokens if token not in self.postings]
+        for token in tokens:
+            self.postings[token].add(uid)
+        self.fields[("category", entry[3].lower())].add(uid)
+        self.fields[("type", entry[2].lower())].add(uid)
+        return entry, new_tokens
+
+    def adjust(self, entry, sign):
+        date, _, type_, category, amount = entry[:5]
+        month = date[:7]
+        self.monthly[(month, type_)] += sign * amount
+        self.monthly_category[(month, type_, category)] += sign * amount
+        breakdown = self.month_breakdown[month]
+        totals = breakdown.setdefault((type_, category), [0.0, 0])
+        totals[0] += sign * amount
+        totals[1] += sign
+        if not totals[1]:
+            del breakdown[(type_, category)]
+
+    def add(self, transaction):
+        entry, new_tokens = self.track(transaction)
+        # track() appended at the end; move the new keys into sorted position
+        insort(self.dates, self.dates.pop())
+        insort(self.amounts, self.amounts.pop())
+        for token in new_tokens:
+            insort(self.vocabulary, token)
+
+    def remove(self, transaction):
+        # Undo exactly what was counted when the transaction was added
+        entry = self.entries.pop(id(transaction), None)
+        if entry is None:
+            return
+        date, uid, type_, category, amount, tokens = entry
+        del self.dates[bisect_left(self.dates, (date, uid))]
+        del self.amounts[bisect_left(self.amounts, (amount, uid))]
+        del self.items[uid]
+        self.adjust(entry, -1)
+        for token in tokens:
+            self.postings[token].discard(uid)
+            if not self.postings[token]:
+                del self.postings[token]
+                del self.vocabulary[bisect_left(self.vocabulary, token)]
+        for key in (("category", category.lower()), ("type", type_.lower())):
+            self.fields[key].discard(uid)
+            if not self.fields[key]:
+                del self.fields[key]
+
+    def update(self, transaction, changes):
+        self.remove(transaction)
+        transaction.update(changes)
+        self.add(transaction)
+
+    def month_total(self, month, type_="expense", category=None):
+        if category:
+            return self.monthly_category.get((month, type_, category), 0.0)
+        return self.monthly.get((month, type_), 0.0)
+
+    def in_range(self, start, end):
+        # Binary search the date-sorted index; only transactions inside the range are visited
+        lo = bisect_left(self.dates, (start,))
+        hi = bisect_right(self.dates, (end, float('inf')))
+        return [self.items[uid] for _, uid in self.dates[lo:hi]]
+
+    def range_summary(self, start, end):
+        income = 0
+        expenses = 0
+        category_expenses = {}
+        for transaction in self.in_range(start, end):
+            if transaction["type"] == "income":
+                income += transaction["amount"]
+            else:
+                expenses += transaction["amount"]
+                category = transaction["category"]
+                category_expenses[category] = category_expenses.get(category, 0) + transaction["amount"]
+        return income, expenses, category_expenses
+
+    def period_summary(self, months):
+        # Whole months come from the running totals; cost depends on categories, not transactions
+        income = 0
+        expenses = 0
+        category_expenses = {}
+        for month in months:
+            for (type_, category), (total, _) in self.month_breakdown.get(month, {}).items():
+                if type_ == "income":
+                    income += total
+                else:
+                    expenses += total
+                    category_expenses[category] = category_expenses.get(category, 0) + total
+        return income, expenses, category_expenses
+
+    def prefix_matches(self, prefix):
+        lo = bisect_left(self.vocabulary, prefix)
+        hi = bisect_left(self.vocabulary, prefix + '\uffff')
+        uids = set()
+        for token in self.vocabulary[lo:hi]:
+            uids |= self.postings[token]
+        return uids
+
+    def amount_matches(self, op, value):
+        if op in ("=", ":"):
+            lo = bisect_left(self.amounts, (value,))
+            hi = bisect_right(self.amounts, (value, float('inf')))
+        elif op == ">":
+            lo, hi = bisect_right(self.amounts, (value, float('inf'))), len(self.amounts)
+        elif op == ">=":
+            lo, hi = bisect_left(self.amounts, (value,)), len(self.amounts)
+        elif op == "<":
+            lo, hi = 0, bisect_left(self.amounts, (value,))
+        else:
+            lo, hi = 0, bisect_right(self.amounts, (value, float('inf')))
+        return {uid for _, uid in self.amounts[lo:hi]}
+
+    def term_matches(self, term):
+        amount = AMOUNT_RE.match(term)
+        if amount:
+            return self.amount_matches(amount.group(1), float(amount.group(2)))
+        field = FIELD_RE.match(term)
+        if field:
+            return self.fields.get((field.group(1), field.group(2)), set())
+        # Bare words match description/category tokens by prefix; bare numbers also match amounts
+        uids = set()
+        for token in TOKEN_RE.findall(term):
+            uids |= self.prefix_matches(token)
+        try:
+            uids |= self.amount_matches("=", float(term))
+        except ValueError:
+            pass
+        return uids
+
+    def search(self, query, category=None):
+        # Every term must match, e.g. "groc category:food amount>500"; results in date order
+        terms = query.lower().split()
+        if category:
+            terms.append("category:" + category.lower())
+        if not terms:
+            return [self.items[uid] for _, uid in self.dates]
+
+        # Intersect the smallest candidate sets first
+        candidates = sorted((self.term_matches(term) for term in terms), key=len)
+        uids = candidates[0]
+        for matches in candidates[1:]:
+            if not uids:
+                break
+            uids = uids & matches
+        keys = sorted((self.entries[id(self.items[uid])][0], uid) for uid in uids)
+        return [self.items[uid] for _, uid in keys]
@@ -0,0 +1,123 @@
+import json
+import os
+
+
+def empty_state():
+    return {
+        "password_hash": "",
+        "transactions": [],
+        "budget_goals": {},
+        "recurring": [],
+        "next_id": 1
+    }
+
+
+def apply_op(state, op):
+    kind = op["op"]
+    if kind == "add":
+        state["transactions"].append(op["transaction"])
+        state["next_id"] = max(state["next_id"], op["transaction"]["id"] + 1)
+        if op.get("recurring"):
+            template = dict(op["transaction"])
+            if op.get("next_due"):
+                template["next_due"] = op["next_due"]
+            state["recurring"].append(template)
+    elif kind == "recur":
+        # One entry for a whole catch-up batch of recurring occurrences
+        state["transactions"].extend(op["transactions"])
+        for transaction in op["transactions"]:
+            state["next_id"] = max(state["next_id"], transaction["id"] + 1)
+        advances = dict(op["advances"])
+        for template in state["recurring"]:
+            if template["id"] in advances:
+                template["next_due"] = advances[template["id"]]
+    elif kind == "edit":
+        for collection in (state["transactions"], state["recurring"]):
+            for transaction in collection:
+                if transaction["id"] == op["id"]:
+                    transaction.update(op["changes"])
+    elif kind == "delete":
+        state["transactions"] = [t for t in state["transactions"] if t["id"] != op["id"]]
+        state["recurring"] = [t for t in state["recurring"] if t["id"] != op["id"]]
+    elif kind == "budget":
+        state["budget_goals"][op["category"]] = op["amount"]
+    elif kind == "password":
+        state["password_hash"] = op["hash"]
+
+
+class JournalStore:
+    def __init__(self, snapshot_path="transactions.json", journal_path=None, compact_every=500):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + ".journal.jsonl"
+        self.compact_every = compact_every
+        self.seq = 0
+        self.pending = 0
+        self.journal = None
+
+    def load(self):
+        state = empty_state()
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f)
+            for key in state:
+                state[key] = data.get(key, state[key])
+            snapshot_seq = data.get("journal_seq", 0)
+        self.seq = snapshot_seq
+
+        # Replay operations written after the snapshot
+        if os.path.exists(self.journal_path):
+            good_offset = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    # Every entry ends with a newline; anything else is a write cut short
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break
+                    good_offset += len(line)
+                    if op["seq"] <= snapshot_seq:
+                        continue
+                    apply_op(state, op)
+                    self.seq = op["seq"]
+                    self.pending += 1
+                torn = f.seek(0, os.SEEK_END) > good_offset
+            if torn:
+                # Cut the torn tail off so the next append starts on a fresh line
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(good_offset)
+        return state
+
+    def append(self, op):
+        self.seq += 1
+        op = dict(op, seq=self.seq)
+        if self.journal is None:
+            self.journal = open(self.journal_path, 'a')
+        self.journal.write(json.dumps(op, separators=(',', ':')) + "\n")
+        self.journal.flush()
+        self.pending += 1
+        return self.pending >= self.compact_every
+
+    def compact(self, state):
+        # Write the new snapshot beside the old one, then swap it in atomically
+        data = dict(state, journal_seq=self.seq)
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        # Entries up to journal_seq are now in the snapshot, so the journal can restart
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        open(self.journal_path, 'w').close()
+        self.pending = 0
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
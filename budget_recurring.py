@@ -0,0 +1,78 @@
+import calendar
+import heapq
+from datetime import datetime
+
+
+def add_months(date, months, day=None):
+    # Keep the template's day of month, clamped for short months
+    month_index = date.month - 1 + months
+    year, month = date.year + month_index // 12, month_index % 12 + 1
+    day = min(day or date.day, calendar.monthrange(year, month)[1])
+    return date.replace(year=year, month=month, day=day)
+
+
+def last_occurrence(template, transactions):
+    # Templates written before scheduling existed: resume after the newest copy
+    last = template["date"]
+    for transaction in transactions:
+        if (transaction.get("recurring") and
+                transaction["type"] == template["type"] and
+                transaction["category"] == template["category"] and
+                transaction["description"] == template["description"]):
+            last = max(last, transaction["date"])
+    return last
+
+
+class RecurringScheduler:
+    def __init__(self, templates=(), transactions=()):
+        self.templates = {}
+        self.heap = []
+        for template in templates:
+            if "next_due" not in template:
+                last = datetime.fromisoformat(last_occurrence(template, transactions))
+                anchor = datetime.fromisoformat(template["date"]).day
+                template["next_due"] = add_months(last, 1, anchor).isoformat()
+            self.templates[template["id"]] = template
+            self.heap.append((template["next_due"], template["id"]))
+        heapq.heapify(self.heap)
+
+    def schedule(self, template):
+        self.templates[template["id"]] = template
+        heapq.heappush(self.heap, (template["next_due"], template["id"]))
+
+    def cancel(self, template_id):
+        # Stale heap entries are skipped when they surface
+        self.templates.pop(template_id, None)
+
+    def peek(self):
+        while self.heap:
+            due, template_id = self.heap[0]
+            template = self.templates.get(template_id)
+            if template is not None and template["next_due"] == due:
+                return due
+            heapq.heappop(self.heap)
+        return None
+
+    def run_due(self, now, new_id):
+        # Returns new transactions plus (template_id, next_due) advances for one write
+        now = now.isoformat()
+        created = []
+        advances = []
+        while True:
+            due = self.peek()
+            if due is None or due > now:
+                break
+            _, template_id = heapq.heappop(self.heap)
+            template = self.templates[template_id]
+            anchor = datetime.fromisoformat(template["date"]).day
+            next_due = due
+            # Catch up every missed period, not just the latest one
+            while next_due <= now:
+                transaction = dict(template, id=new_id(), date=next_due)
+                transaction.pop("next_due", None)
+                created.append(transaction)
+                next_due = add_months(datetime.fromisoformat(next_due), 1, anchor).isoformat()
+            template["next_due"] = next_due
+            advances.append((template_id, next_due))
+            heapq.heappush(self.heap, (next_due, template_id))
+        return created, advances
@@ -0,0 +1,129 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from budget_journal import JournalStore
+
+COLUMNS = ["id", "type", "amount", "category", "description", "date"]
+
+
+def to_frame(transactions):
+    # One columnar copy of the ledger; every report below is a vectorized pass over it
+    df = pd.DataFrame.from_records(transactions, columns=COLUMNS)
+    df["date"] = pd.to_datetime(df["date"], format="ISO8601")
+    df["amount"] = df["amount"].astype(float)
+    df["category"] = df["category"].astype("category")
+    df["month"] = df["date"].dt.to_period("M")
+    df["is_income"] = (df["type"] == "income").to_numpy()
+    return df
+
+
+class BudgetReport:
+    def __init__(self, transactions, window=3):
+        self.df = to_frame(transactions)
+        self.window = window
+        if self.df.empty:
+            self.months = pd.PeriodIndex([], freq="M")
+        else:
+            self.months = pd.period_range(self.df["month"].min(), self.df["month"].max(), freq="M")
+
+    def month_category(self):
+        # Expenses as a month x category grid, with empty months kept as zero rows
+        expenses = self.df[~self.df["is_income"]]
+        pivot = expenses.pivot_table(index="month", columns="category", values="amount",
+                                     aggfunc="sum", fill_value=0, observed=True)
+        return pivot.reindex(self.months, fill_value=0)
+
+    def monthly(self):
+        amounts = self.df["amount"].to_numpy()
+        income = np.where(self.df["is_income"], amounts, 0.0)
+        totals = pd.DataFrame({"income": income, "expenses": amounts - income,
+                               "month": self.df["month"]}).groupby("month").sum()
+        totals = totals.reindex(self.months, fill_value=0)
+        totals["net"] = totals["income"] - totals["expenses"]
+        totals[f"expenses_avg_{self.window}m"] = totals["expenses"].rolling(self.window, min_periods=1).mean()
+        totals[f"net_avg_{self.window}m"] = totals["net"].rolling(self.window, min_periods=1).mean()
+        return totals
+
+    def yearly_category(self):
+        grid = self.month_category()
+        return grid.groupby(grid.index.year).sum()
+
+    def plot_monthly(self, monthly, path):
+        # Figure objects render through Agg directly, so no window or GUI backend is needed
+        fig = Figure(figsize=(12, 6))
+        ax = fig.add_subplot()
+        x = monthly.index.to_timestamp()
+        ax.plot(x, monthly["income"], label="Income")
+        ax.plot(x, monthly["expenses"], label="Expenses")
+        ax.plot(x, monthly[f"expenses_avg_{self.window}m"], label=f"Expenses ({self.window}-month avg)",
+                linestyle="--")
+        ax.set_title("Monthly Income and Expenses")
+        ax.set_ylabel("Amount ($)")
+        ax.legend()
+        fig.tight_layout()
+        fig.savefig(path, dpi=100)
+
+    def plot_categories(self, grid, path, top=8):
+        # Largest categories stacked individually, the rest folded into "Other"
+        order = grid.sum().sort_values(ascending=False).index
+        shown = grid[order[:top]]
+        if len(order) > top:
+            shown = shown.assign(Other=grid[order[top:]].sum(axis=1))
+        fig = Figure(figsize=(12, 6))
+        ax = fig.add_subplot()
+        x = grid.index.to_timestamp()
+        # One filled polygon per category rather than a bar patch per month
+        ax.stackplot(x, shown.to_numpy().T, labels=[str(c) for c in shown.columns], step="mid")
+        ax.set_title("Expenses by Category per Month")
+        ax.set_ylabel("Amount ($)")
+        ax.legend(ncol=3, fontsize="small")
+        fig.tight_layout()
+        fig.savefig(path, dpi=100)
+
+    def write(self, output_dir="budget_reports"):
+        os.makedirs(output_dir, exist_ok=True)
+        monthly = self.monthly()
+        grid = self.month_category()
+        paths = {
+            "monthly_csv": os.path.join(output_dir, "monthly_summary.csv"),
+            "category_csv": os.path.join(output_dir, "month_by_category.csv"),
+            "yearly_csv": os.path.join(output_dir, "year_by_category.csv"),
+            "monthly_png": os.path.join(output_dir, "monthly_summary.png"),
+            "category_png": os.path.join(output_dir, "month_by_category.png")
+        }
+        monthly.to_csv(paths["monthly_csv"], float_format="%.2f")
+        grid.to_csv(paths["category_csv"], float_format="%.2f")
+        self.yearly_category().to_csv(paths["yearly_csv"], float_format="%.2f")
+        if len(grid):
+            self.plot_monthly(monthly, paths["monthly_png"])
+        # Income-only ledgers have months but no expense categories to stack
+        if len(grid) and grid.shape[1]:
+            self.plot_categories(grid, paths["category_png"])
+        return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write budget reports without opening any windows')
+    parser.add_argument('data', nargs='?', default='transactions.json',
+                        help='BudgetTracker snapshot; its journal is replayed as well')
+    parser.add_argument('--output', default='budget_reports')
+    parser.add_argument('--window', type=int, default=3, help='Rolling average window in months')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    transactions = JournalStore(args.data).load()["transactions"]
+    paths = BudgetReport(transactions, args.window).write(args.output)
+    elapsed = time.perf_counter() - start
+    print(f"Reported {len(transactions)} transactions in {elapsed:.2f}s")
+    for path in paths.values():
+        if os.path.exists(path):
+            print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
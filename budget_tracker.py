@@ -1,48 +1,63 @@
 import os
-import json
 import csv
 import hashlib
 import getpass
 from datetime import datetime, timedelta
 from colorama import init, Fore, Back, Style
 import matplotlib.pyplot as plt
+from budget_journal import JournalStore
+from budget_index import TransactionIndex
+from budget_recurring import RecurringScheduler, add_months
+from budget_reports import BudgetReport
 
 class BudgetTracker:
     def __init__(self):
         init()  # Initialize colorama
         self.data_file = "transactions.json"
         self.theme = "light"  # Default theme
+        self.store = JournalStore(self.data_file)
         self.load_data()
         self.check_recurring_transactions()
 
     def load_data(self):
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'r') as f:
-                data = json.load(f)
-                self.password_hash = data.get("password_hash", "")
-                self.transactions = data.get("transactions", [])
-                self.budget_goals = data.get("budget_goals", {})
-                self.recurring = data.get("recurring", [])
-        else:
-            self.password_hash = ""
-            self.transactions = []
-            self.budget_goals = {}
-            self.recurring = []
+        # Snapshot plus replay of the append-only journal
+        data = self.store.load()
+        self.password_hash = data["password_hash"]
+        self.transactions = data["transactions"]
+        self.budget_goals = data["budget_goals"]
+        self.recurring = data["recurring"]
+        # Month/category totals and a date-sorted index, kept current on every change
+        self.index = TransactionIndex(self.transactions)
+        # Ids only ever grow, so deletes can never cause a collision
+        ids = [t["id"] for t in self.transactions + self.recurring]
+        self.next_id = max([data["next_id"]] + [i + 1 for i in ids])
+        self.scheduler = RecurringScheduler(self.recurring, self.transactions)
 
     def save_data(self):
+        # Full rewrite: folds the journal into a fresh snapshot
         data = {
             "password_hash": self.password_hash,
             "transactions": self.transactions,
             "budget_goals": self.budget_goals,
-            "recurring": self.recurring
+            "recurring": self.recurring,
+            "next_id": self.next_id
         }
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f, indent=4)
+        self.store.compact(data)
+
+    def record(self, op):
+        # Each change appends one journal line; compaction runs every few hundred
+        if self.store.append(op):
+            self.save_data()
+
+    def new_id(self):
+        id_ = self.next_id
+        self.next_id += 1
+        return id_
 
     def set_password(self):
         password = getpass.getpass("Set your password: ")
         self.password_hash = hashlib.sha256(password.encode()).hexdigest()
-        self.save_data()
+        self.record({"op": "password", "hash": self.password_hash})
 
     def verify_password(self):
         if not self.password_hash:
@@ -55,7 +70,7 @@ class BudgetTracker:
 
     def add_transaction(self, type_, amount, category, description, recurring=False):
         transaction = {
-            "id": len(self.transactions) + 1,
+            "id": self.new_id(),
             "type": type_,
             "amount": float(amount),
             "category": category,
@@ -64,27 +79,43 @@ class BudgetTracker:
             "recurring": recurring
         }
         self.transactions.append(transaction)
+        self.index.add(transaction)
+        op = {"op": "add", "transaction": transaction, "recurring": recurring}
         if recurring:
-            self.recurring.append(transaction)
-        self.save_data()
+            template = dict(transaction)
+            template["next_due"] = add_months(datetime.fromisoformat(transaction["date"]), 1).isoformat()
+            self.recurring.append(template)
+            self.scheduler.schedule(template)
+            op["next_due"] = template["next_due"]
+        self.record(op)
         self.check_budget_alerts(category)
 
     def edit_transaction(self, id_, **kwargs):
+        found = False
         for transaction in self.transactions:
+            if transaction["id"] == id_:
+                self.index.update(transaction, kwargs)
+                found = True
+        for transaction in self.recurring:
             if transaction["id"] == id_:
                 transaction.update(kwargs)
-                self.save_data()
-                return True
-        return False
+                found = True
+        if found:
+            self.record({"op": "edit", "id": id_, "changes": kwargs})
+        return found
 
     def delete_transaction(self, id_):
+        for transaction in self.transactions:
+            if transaction["id"] == id_:
+                self.index.remove(transaction)
         self.transactions = [t for t in self.transactions if t["id"] != id_]
         self.recurring = [t for t in self.recurring if t["id"] != id_]
-        self.save_data()
+        self.scheduler.cancel(id_)
+        self.record({"op": "delete", "id": id_})
 
     def set_budget_goal(self, category, amount):
         self.budget_goals[category] = float(amount)
-        self.save_data()
+        self.record({"op": "budget", "category": category, "amount": float(amount)})
 
     def check_budget_alerts(self, category):
         if category in self.budget_goals:
@@ -96,28 +127,19 @@ class BudgetTracker:
                     print(f"Consider reducing {category} expenses for the rest of the month.")
 
     def get_monthly_expenses(self, category=None):
-        today = datetime.now()
-        start_date = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        total = 0
-        for transaction in self.transactions:
-            if transaction["type"] == "expense":
-                if category and transaction["category"] != category:
-                    continue
-                date = datetime.fromisoformat(transaction["date"])
-                if date >= start_date:
-                    total += transaction["amount"]
-        return total
+        month = datetime.now().strftime("%Y-%m")
+        return self.index.month_total(month, "expense", category)
 
     def check_recurring_transactions(self):
-        today = datetime.now()
-        for transaction in self.recurring:
-            last_date = datetime.fromisoformat(transaction["date"])
-            if (today.year > last_date.year) or (today.month > last_date.month):
-                new_transaction = transaction.copy()
-                new_transaction["id"] = len(self.transactions) + 1
-                new_transaction["date"] = today.isoformat()
-                self.transactions.append(new_transaction)
-        self.save_data()
+        # Only templates at the top of the next-due heap are looked at; every missed
+        # period is created and the whole batch is journaled as one entry
+        created, advances = self.scheduler.run_due(datetime.now(), self.new_id)
+        if not created:
+            return
+        for transaction in created:
+            self.transactions.append(transaction)
+            self.index.add(transaction)
+        self.record({"op": "recur", "transactions": created, "advances": advances})
 
     def get_date_range(self, summary_type):
         today = datetime.now()
@@ -127,9 +149,6 @@ class BudgetTracker:
         elif summary_type == "2":  # Weekly
             start_date = today - timedelta(days=today.weekday())
             end_date = today
-        elif summary_type == "3":  # Monthly
-            start_date = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            end_date = today
         else:  # Custom
             start_str = input("Enter start date (YYYY-MM-DD): ")
             end_str = input("Enter end date (YYYY-MM-DD): ")
@@ -137,24 +156,26 @@ class BudgetTracker:
             end_date = datetime.strptime(end_str, "%Y-%m-%d")
         return start_date, end_date
 
+    def get_summary_months(self, summary_type):
+        today = datetime.now()
+        if summary_type == "3":  # Monthly
+            return today.strftime("%Y-%m"), [today.strftime("%Y-%m")]
+        if summary_type == "5":  # Yearly
+            return str(today.year), [f"{today.year}-{month:02d}" for month in range(1, 13)]
+        return None, None
+
     def show_summary(self, summary_type):
-        start_date, end_date = self.get_date_range(summary_type)
-        
-        income = 0
-        expenses = 0
-        category_expenses = {}
+        # Calendar months and years use the index's monthly totals; other ranges walk the dates
+        label, months = self.get_summary_months(summary_type)
+        if months:
+            income, expenses, category_expenses = self.index.period_summary(months)
+        else:
+            start_date, end_date = self.get_date_range(summary_type)
+            income, expenses, category_expenses = self.index.range_summary(
+                start_date.isoformat(), end_date.isoformat())
+            label = f"{start_date.date()} to {end_date.date()}"
 
-        for transaction in self.transactions:
-            date = datetime.fromisoformat(transaction["date"])
-            if start_date <= date <= end_date:
-                if transaction["type"] == "income":
-                    income += transaction["amount"]
-                else:
-                    expenses += transaction["amount"]
-                    category = transaction["category"]
-                    category_expenses[category] = category_expenses.get(category, 0) + transaction["amount"]
-
-        print(f"\nSummary ({start_date.date()} to {end_date.date()})")
+        print(f"\nSummary ({label})")
         print(f"Total Income: ${income:.2f}")
         print(f"Total Expenses: ${expenses:.2f}")
         print(f"Net Savings: ${income - expenses:.2f}")
@@ -192,18 +213,8 @@ class BudgetTracker:
         plt.show()
 
     def search_transactions(self, keyword, category=None):
-        results = []
-        keyword = keyword.lower()
-        
-        for transaction in self.transactions:
-            if category and transaction["category"] != category:
-                continue
-            if (keyword in transaction["description"].lower() or
-                keyword in transaction["category"].lower() or
-                keyword in str(transaction["amount"])):
-                results.append(transaction)
-        
-        return results
+        # Served from the inverted index: prefix words plus category:, type: and amount filters
+        return self.index.search(keyword, category)
 
     def export_to_csv(self):
         csv_file = f"budget_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
@@ -213,6 +224,14 @@ class BudgetTracker:
             writer.writerows(self.transactions)
         print(f"Data exported to {csv_file} successfully!")
 
+    def generate_reports(self, output_dir="budget_reports"):
+        # Columnar month x category reports written to disk; no plot windows are opened
+        paths = BudgetReport(self.transactions).write(output_dir)
+        print(f"Reports written to {output_dir}/:")
+        for path in paths.values():
+            if os.path.exists(path):
+                print(f"  {os.path.basename(path)}")
+
     def toggle_theme(self):
         self.theme = "dark" if self.theme == "light" else "light"
         if self.theme == "dark":
@@ -222,6 +241,7 @@ class BudgetTracker:
 
     def main_menu(self):
         while True:
+            self.check_recurring_transactions()
             print("\n=== Personal Budget Tracker ===")
             print("1. Add Transaction")
             print("2. Edit Transaction")
@@ -231,9 +251,10 @@ class BudgetTracker:
             print("6. Set Budget Goals")
             print("7. Export Data")
             print("8. Toggle Theme")
-            print("9. Exit")
+            print("9. Generate Reports")
+            print("10. Exit")
 
-            choice = input("\nEnter your choice (1-9): ")
+            choice = input("\nEnter your choice (1-10): ")
             
             if choice == "1":
                 type_ = input("Type (income/expense): ")
@@ -260,11 +281,12 @@ class BudgetTracker:
                 print("2. Weekly Summary")
                 print("3. Monthly Summary")
                 print("4. Custom Date Range")
-                summary_choice = input("Choose summary type (1-4): ")
+                print("5. Yearly Summary")
+                summary_choice = input("Choose summary type (1-5): ")
                 self.show_summary(summary_choice)
 
             elif choice == "5":
-                keyword = input("Enter search keyword: ")
+                keyword = input("Enter search (e.g. groc category:food amount>500): ")
                 category = input("Enter category (or press Enter to skip): ")
                 results = self.search_transactions(keyword, category)
                 for transaction in results:
@@ -287,6 +309,11 @@ class BudgetTracker:
                 self.toggle_theme()
 
             elif choice == "9":
+                self.generate_reports()
+
+            elif choice == "10":
+                self.save_data()
+                self.store.close()
                 print("Thank you for using Personal Budget Tracker!")
                 break
 
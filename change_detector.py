@@ -0,0 +1,95 @@
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+
+
+def fingerprint(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha1(data).hexdigest()
+
+
+def record_key(record):
+    # Table rows are identified by their first cell, everything else by content
+    source = record['source']
+    if source.startswith('tables[') and isinstance(record['value'], str):
+        try:
+            row = json.loads(record['value'])
+            return f"{source}:{next(iter(row.values()), '')}"
+        except ValueError:
+            pass
+    return f"{source}:{fingerprint(str(record['value']))}"
+
+
+class ChangeDetector:
+    def __init__(self, db_path='scraper_history.db'):
+        self.db_path = db_path
+        self.init_db()
+
+    def init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute('''CREATE TABLE IF NOT EXISTS page_fingerprints
+                    (url TEXT PRIMARY KEY, hash TEXT, checked TEXT, changed TEXT)''')
+        c.execute('''CREATE TABLE IF NOT EXISTS record_fingerprints
+                    (url TEXT, record_key TEXT, hash TEXT, PRIMARY KEY (url, record_key))''')
+        conn.commit()
+        conn.close()
+
+    # State is kept per scope (e.g. "job:3"), so jobs that extract different things
+    # from the same URL keep separate fingerprints; the URL is the default scope
+    def page_changed(self, url, body, scope=None):
+        scope = scope or url
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute('SELECT hash FROM page_fingerprints WHERE url = ?', (scope,)).fetchone()
+        if row and row[0] == fingerprint(body):
+            conn.execute('UPDATE page_fingerprints SET checked = ? WHERE url = ?',
+                         (datetime.now().isoformat(), scope))
+            conn.commit()
+            conn.close()
+            return False
+        conn.close()
+        return True
+
+    def diff(self, url, records, body, scope=None):
+        scope = scope or url
+        conn = sqlite3.connect(self.db_path)
+        previous = dict(conn.execute(
+            'SELECT record_key, hash FROM record_fingerprints WHERE url = ?', (scope,)))
+
+        current = {}
+        changes = {'added': [], 'changed': [], 'removed': []}
+        for record in records:
+            key = record_key(record)
+            # Repeated keys on the same page get an occurrence suffix
+            base, n = key, 1
+            while key in current:
+                n += 1
+                key = f"{base}#{n}"
+            # Content only: the positional index would mark every later record as changed
+            # whenever one is inserted above it
+            digest = fingerprint(json.dumps(record['value'], sort_keys=True, default=str))
+            current[key] = digest
+            if key not in previous:
+                changes['added'].append(record)
+            elif previous[key] != digest:
+                changes['changed'].append(record)
+        changes['removed'] = [key for key in previous if key not in current]
+
+        # Store the new fingerprints and the page hash in one transaction
+        now = datetime.now().isoformat()
+        with conn:
+            conn.executemany('DELETE FROM record_fingerprints WHERE url = ? AND record_key = ?',
+                             [(scope, key) for key in changes['removed']])
+            conn.executemany('INSERT OR REPLACE INTO record_fingerprints (url, record_key, hash) '
+                             'VALUES (?, ?, ?)',
+                             [(scope, key, digest) for key, digest in current.items()
+                              if previous.get(key) != digest])
+            conn.execute('''INSERT INTO page_fingerprints (url, hash, checked, changed)
+                            VALUES (?, ?, ?, ?)
+                            ON CONFLICT(url) DO UPDATE SET hash = excluded.hash,
+                                checked = excluded.checked, changed = excluded.changed''',
+                         (scope, fingerprint(body), now, now))
+        conn.close()
+        return changes
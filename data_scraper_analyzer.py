@@ -1,14 +1,13 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import seaborn as sns
 import numpy as np
 from datetime import datetime
 import json
+from sales_analytics import SalesAnalytics
+from table_ingest import ingest, cache_path, save_parquet
 
 class DataScraperAnalyzer:
     def __init__(self):
@@ -18,6 +17,7 @@ class DataScraperAnalyzer:
         self.window.configure(bg='#2C3E50')
         
         self.df = None
+        self.analytics = None
         self.scraped_data = None
         self.create_gui()
         
@@ -39,6 +39,28 @@ class DataScraperAnalyzer:
         self.url_entry.pack(side='left', fill='x', expand=True, padx=5)
         ttk.Button(url_frame, text="Scrape", command=self.scrape_data).pack(side='right', padx=5)
         
+        # Pagination options
+        pages_frame = ttk.Frame(left_panel)
+        pages_frame.pack(fill='x', pady=5)
+        
+        self.follow_next = tk.BooleanVar(value=False)
+        ttk.Checkbutton(pages_frame, text="Follow 'next' links",
+                       variable=self.follow_next).pack(side='left', padx=5)
+        ttk.Label(pages_frame, text="Max pages:").pack(side='left', padx=5)
+        self.max_pages = ttk.Spinbox(pages_frame, from_=1, to=500, width=5)
+        self.max_pages.set(20)
+        self.max_pages.pack(side='left')
+        ttk.Label(pages_frame, text="URL template ({page}):").pack(side='left', padx=5)
+        self.url_template = ttk.Entry(pages_frame, width=30)
+        self.url_template.pack(side='left', fill='x', expand=True, padx=5)
+        ttk.Label(pages_frame, text="Pages:").pack(side='left')
+        self.first_page = ttk.Spinbox(pages_frame, from_=0, to=10000, width=5)
+        self.first_page.set(1)
+        self.first_page.pack(side='left')
+        self.last_page = ttk.Spinbox(pages_frame, from_=0, to=10000, width=5)
+        self.last_page.set(1)
+        self.last_page.pack(side='left', padx=5)
+        
         # Data display
         self.data_display = scrolledtext.ScrolledText(left_panel, height=20)
         self.data_display.pack(fill='both', expand=True, pady=5)
@@ -77,22 +99,32 @@ class DataScraperAnalyzer:
         
     def scrape_data(self):
         url = self.url_entry.get()
-        if not url:
+        template = self.url_template.get().strip()
+        if not url and not template:
             messagebox.showwarning("Warning", "Please enter a URL!")
             return
             
         try:
             headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find all tables in the webpage
-            tables = pd.read_html(response.text)
-            if tables:
-                self.df = tables[0]  # Take the first table
+            
+            # Fetch every page, then merge all tables that share a schema
+            df, stats = ingest(url, template=template or None,
+                               first=int(self.first_page.get()), last=int(self.last_page.get()),
+                               follow_next=self.follow_next.get(),
+                               max_pages=int(self.max_pages.get()), headers=headers)
+            if df is not None:
+                self.df = df
+                
+                # Columnar cache lets analyses load only the columns they use
+                path = save_parquet(self.df, cache_path(template or url))
+                self.analytics = SalesAnalytics.from_parquet(path) if path else SalesAnalytics(self.df)
+                
                 self.data_display.delete(1.0, tk.END)
-                self.data_display.insert(tk.END, self.df.to_string())
+                self.data_display.insert(tk.END, f"Pages: {stats['pages']}  Tables found: {stats['tables']}  "
+                                                 f"Merged: {stats['merged']}  Skipped (schema mismatch): "
+                                                 f"{stats['skipped']}  Rows: {len(self.df)}\n\n")
+                self.data_display.insert(tk.END, self.df.head(500).to_string())
+                self.show_summary()
                 
                 # Update column selections
                 self.x_col['values'] = self.df.columns.tolist()
@@ -111,12 +143,7 @@ class DataScraperAnalyzer:
             return
             
         try:
-            # Assuming date column exists
-            date_col = next(col for col in self.df.columns if 'date' in col.lower())
-            sales_col = next(col for col in self.df.columns if 'sale' in col.lower() or 'amount' in col.lower())
-            
-            self.df[date_col] = pd.to_datetime(self.df[date_col])
-            monthly_sales = self.df.groupby(self.df[date_col].dt.strftime('%Y-%m'))[sales_col].sum()
+            monthly_sales = self.analytics.monthly_sales()
             
             plt.figure(figsize=(10, 6))
             monthly_sales.plot(kind='bar')
@@ -136,10 +163,7 @@ class DataScraperAnalyzer:
             return
             
         try:
-            product_col = next(col for col in self.df.columns if 'product' in col.lower())
-            sales_col = next(col for col in self.df.columns if 'sale' in col.lower() or 'amount' in col.lower())
-            
-            top_products = self.df.groupby(product_col)[sales_col].sum().sort_values(ascending=False).head(10)
+            top_products = self.analytics.top_products(10)
             
             plt.figure(figsize=(10, 6))
             top_products.plot(kind='bar')
@@ -159,8 +183,10 @@ class DataScraperAnalyzer:
             return
             
         try:
+            data = self.analytics.trend(self.x_col.get(), self.y_col.get())
+            
             plt.figure(figsize=(10, 6))
-            plt.plot(self.df[self.x_col.get()], self.df[self.y_col.get()])
+            plt.plot(data[self.x_col.get()], data[self.y_col.get()])
             plt.title('Sales Trend Analysis')
             plt.xlabel(self.x_col.get())
             plt.ylabel(self.y_col.get())
@@ -177,10 +203,8 @@ class DataScraperAnalyzer:
             return
             
         try:
-            category_col = next(col for col in self.df.columns if 'category' in col.lower())
-            
             plt.figure(figsize=(10, 6))
-            self.df[category_col].value_counts().plot(kind='pie', autopct='%1.1f%%')
+            self.analytics.category_counts().plot(kind='pie', autopct='%1.1f%%')
             plt.title('Category Distribution')
             
             self.display_plot()
@@ -188,6 +212,15 @@ class DataScraperAnalyzer:
         except Exception as e:
             messagebox.showerror("Error", f"Analysis failed: {str(e)}")
             
+    def show_summary(self):
+        try:
+            summary = self.analytics.summary()
+        except ValueError:
+            return
+        self.data_display.insert(tk.END, "\n\nSummary:\n")
+        for name, value in summary.items():
+            self.data_display.insert(tk.END, f"{name}: {value}\n")
+            
     def display_plot(self):
         # Clear previous plot
         for widget in self.graph_frame.winfo_children():
@@ -0,0 +1,292 @@
+import argparse
+import io
+import re
+import time
+from collections import defaultdict
+
+from bs4 import BeautifulSoup, NavigableString, CData, Tag
+import pandas as pd
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+TEXT_TYPES = (NavigableString, CData)
+
+
+def make_soup(html, parser=None):
+    return BeautifulSoup(html, parser or DEFAULT_PARSER)
+
+
+def extract_single_pass(soup, tables=False, links=False, images=False, text=False):
+    link_list = []
+    image_list = []
+    table_nodes = []
+    text_parts = []
+
+    # Visit every node once and drop it into each requested bucket
+    for node in soup.descendants:
+        if isinstance(node, Tag):
+            name = node.name
+            if name == 'a':
+                if links:
+                    link_list.append(node.get('href'))
+            elif name == 'img':
+                if images:
+                    image_list.append(node.get('src'))
+            elif name == 'table':
+                if tables:
+                    table_nodes.append(node)
+        elif text and type(node) in TEXT_TYPES:
+            text_parts.append(node)
+
+    data = {}
+    if tables:
+        data['tables'] = [df for df in map(parse_table, table_nodes) if df is not None]
+    if links:
+        data['links'] = link_list
+    if images:
+        data['images'] = image_list
+    if text:
+        data['text'] = ''.join(text_parts)
+    return data
+
+
+def build_class_index(soup):
+    # One traversal maps every class token to the tags carrying it, in document order
+    index = defaultdict(list)
+    for position, node in enumerate(soup.find_all(True)):
+        for token in node.get('class') or ():
+            index[token].append((position, node))
+    return index
+
+
+def select_by_class(index, pattern):
+    # The regex runs once per distinct token instead of once per tag
+    matched = {}
+    for token, entries in index.items():
+        if pattern.search(token):
+            for position, node in entries:
+                matched[position] = node
+    return [matched[position] for position in sorted(matched)]
+
+
+def own_rows(table):
+    # Rows of this table only, skipping rows that belong to nested tables
+    for child in table.children:
+        if not isinstance(child, Tag):
+            continue
+        if child.name == 'tr':
+            yield child
+        elif child.name in ('thead', 'tbody', 'tfoot'):
+            for row in child.children:
+                if isinstance(row, Tag) and row.name == 'tr':
+                    yield row
+
+
+def span(cell, attribute):
+    try:
+        return max(int(cell.get(attribute, 1)), 1)
+    except ValueError:
+        return 1
+
+
+def dedupe_columns(names):
+    # Same convention as pandas: a repeated "Price" becomes "Price.1", "Price.2", ...
+    counts = defaultdict(int)
+    result = []
+    for name in names:
+        count = counts[name]
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts[name]
+        result.append(name)
+        counts[name] = count + 1
+    return result
+
+
+def take_carried(cells, carried):
+    column = len(cells)
+    value, left = carried[column]
+    cells.append(value)
+    if left == 1:
+        del carried[column]
+    else:
+        carried[column][1] = left - 1
+
+
+def parse_table(table):
+    header = None
+    rows = []
+    carried = {}    # column -> [value, rows left] from rowspan cells above
+    for tr in own_rows(table):
+        tags = [cell for cell in tr.children
+                if isinstance(cell, Tag) and cell.name in ('td', 'th')]
+        if not tags:
+            continue
+        cells = []
+        all_th = True
+        for cell in tags:
+            while len(cells) in carried:
+                take_carried(cells, carried)
+            if cell.name == 'td':
+                all_th = False
+            value = cell.get_text(' ', strip=True)
+            rowspan = span(cell, 'rowspan')
+            for _ in range(span(cell, 'colspan')):
+                if rowspan > 1:
+                    carried[len(cells)] = [value, rowspan - 1]
+                cells.append(value)
+        # Spanned cells can also continue past this row's last own cell
+        while carried and len(cells) <= max(carried):
+            if len(cells) in carried:
+                take_carried(cells, carried)
+            else:
+                cells.append(None)
+        if header is None and not rows and all_th:
+            header = cells
+        else:
+            rows.append(cells)
+
+    if not rows and header is None:
+        return None
+
+    width = max([len(header or [])] + [len(r) for r in rows])
+    rows = [r + [None] * (width - len(r)) for r in rows]
+    if header:
+        header = dedupe_columns(header + [f"Unnamed: {i}" for i in range(len(header), width)])
+    else:
+        header = list(range(width))
+
+    # Coerce columns in plain Python; pandas per-column calls dominate on small tables
+    columns = [coerce_column(list(col)) for col in zip(*rows)] if rows else [[]] * width
+    df = pd.DataFrame(dict(enumerate(columns)))
+    df.columns = header
+    return df
+
+
+def coerce_column(values):
+    numbers = []
+    for value in values:
+        if value is None or value == '':
+            numbers.append(None)
+            continue
+        try:
+            numbers.append(float(value.replace(',', '')))
+        except ValueError:
+            return [None if v == '' else v for v in values]
+    if None not in numbers and all(n.is_integer() for n in numbers):
+        return [int(n) for n in numbers]
+    return [float('nan') if n is None else n for n in numbers]
+
+
+def legacy_extract(soup):
+    data = {}
+    try:
+        data['tables'] = pd.read_html(io.StringIO(str(soup)))
+    except (ValueError, ImportError):
+        data['tables'] = []
+    data['links'] = [a.get('href') for a in soup.find_all('a')]
+    data['images'] = [img.get('src') for img in soup.find_all('img')]
+    data['text'] = soup.get_text()
+    return data
+
+
+def build_page(sections):
+    parts = ['<html><head><title>Benchmark</title></head><body>']
+    for i in range(sections):
+        parts.append(f'<div class="item"><h2>Item {i}</h2>'
+                     f'<p>Description for item {i} with some filler text to pad the page.</p>'
+                     f'<a href="/item/{i}">Item link</a><img src="/img/{i}.png" alt="item">'
+                     f'<table><tr><th>Name</th><th>Price</th><th>Stock</th></tr>'
+                     f'<tr><td>Item {i}</td><td>{i * 1.5:.2f}</td><td>{i % 40}</td></tr>'
+                     f'<tr><td>Item {i}b</td><td>{i * 2.5:.2f}</td><td>{i % 7}</td></tr>'
+                     f'</table></div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def build_product_page(items):
+    parts = ['<html><body><div class="catalog">']
+    for i in range(items):
+        parts.append(f'<div class="product card col-md-4 item-{i % 50}">'
+                     f'<h3 class="title">Product {i}</h3>'
+                     f'<span class="price product-price">Rs. {i * 3.25:.2f}</span>'
+                     f'<div class="rating stars">{i % 5}.{i % 10} out of 5</div>'
+                     f'<span class="views">{i * 7} views</span>'
+                     f'<span class="sold">{i * 2} sold</span>'
+                     f'<ul class="list-unstyled">'
+                     f'<li class="review">Great product, item {i} works well</li>'
+                     f'<li class="comment user-comment">Bad packaging on {i}</li></ul>'
+                     f'<p class="description text-muted">Filler description for product {i}.</p>'
+                     f'</div>')
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+
+def benchmark_class_index(items=9000, repeat=3):
+    patterns = [re.compile(p) for p in ('review|comment', 'rating|stars', 'price',
+                                        'views|visits', 'sales|sold')]
+    html = build_product_page(items)
+    print(f"Page size: {len(html) / 1024 / 1024:.1f} MB")
+    soup = make_soup(html)
+
+    def per_selection():
+        return [soup.find_all(class_=pattern) for pattern in patterns]
+
+    def indexed():
+        index = build_class_index(soup)
+        return [select_by_class(index, pattern) for pattern in patterns]
+
+    for label, select in [('find_all x5', per_selection), ('class index', indexed)]:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = select()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"[{DEFAULT_PARSER}] {label:12s}: {best:.2f}s "
+              f"({', '.join(str(len(r)) for r in results)} matches)")
+
+
+def benchmark(sections=12000, repeat=3):
+    html = build_page(sections)
+    print(f"Page size: {len(html) / 1024 / 1024:.1f} MB")
+
+    parsers = ['html.parser']
+    if DEFAULT_PARSER == 'lxml':
+        parsers.append('lxml')
+
+    for parser in parsers:
+        start = time.perf_counter()
+        soup = make_soup(html, parser)
+        parse_time = time.perf_counter() - start
+        print(f"\n[{parser}] parse: {parse_time:.2f}s")
+
+        for label, extract in [('legacy', legacy_extract),
+                               ('single-pass', lambda s: extract_single_pass(
+                                   s, tables=True, links=True, images=True, text=True))]:
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                data = extract(soup)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"[{parser}] {label:12s} extract: {best:.2f}s "
+                  f"({len(data['tables'])} tables, {len(data['links'])} links)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark single-pass DOM extraction')
+    parser.add_argument('--sections', type=int, default=12000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--class-index', action='store_true',
+                        help='Benchmark class-index selection on a product page instead')
+    args = parser.parse_args()
+    if args.class_index:
+        benchmark_class_index(args.sections, args.repeat)
+    else:
+        benchmark(args.sections, args.repeat)
@@ -0,0 +1,233 @@
+import argparse
+import http.server
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# Installs a MutationObserver once per document and returns ms since the last DOM change
+QUIET_SCRIPT = """
+if (!window.__lastMutation) {
+    window.__lastMutation = performance.now();
+    new MutationObserver(function() { window.__lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return performance.now() - window.__lastMutation;
+"""
+
+
+def chrome_driver(page_load_timeout=30):
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(page_load_timeout)
+    return driver
+
+
+def wait_until_ready(driver, selector=None, timeout=10, quiet_ms=500):
+    wait = WebDriverWait(driver, timeout, poll_frequency=0.1)
+    wait.until(lambda d: d.execute_script('return document.readyState') == 'complete')
+    if selector:
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+    else:
+        # No selector given: wait until the DOM has stopped changing. Carousels, tickers
+        # and ads never do, so those pages are taken as they are once the wait runs out
+        try:
+            wait.until(lambda d: d.execute_script(QUIET_SCRIPT) >= quiet_ms)
+        except TimeoutException:
+            pass
+
+
+class DriverPool:
+    def __init__(self, size=2, max_pages=50, factory=chrome_driver):
+        self.size = size
+        self.max_pages = max_pages
+        self.factory = factory
+        self.idle = []      # most recently used driver last
+        self.lock = threading.Lock()
+        # Signalled whenever a driver goes idle or a slot frees up for a new launch
+        self.available = threading.Condition(self.lock)
+        self.created = 0
+        self.page_counts = {}
+        self.stats = {'launched': 0, 'recycled': 0, 'unhealthy': 0}
+
+    def launch(self):
+        driver = self.factory()
+        self.page_counts[id(driver)] = 0
+        self.stats['launched'] += 1
+        return driver
+
+    def healthy(self, driver):
+        try:
+            return driver.execute_script('return 1') == 1 and bool(driver.window_handles)
+        except WebDriverException:
+            return False
+
+    def retire(self, driver):
+        self.page_counts.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        self.retire_slot()
+
+    def retire_slot(self):
+        # Wake a waiter so it can launch a replacement
+        with self.available:
+            self.created -= 1
+            self.available.notify()
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.available:
+            while not self.idle and self.created >= self.size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No browser became available")
+                self.available.wait(remaining)
+            driver = self.idle.pop() if self.idle else None
+            if driver is None:
+                self.created += 1
+
+        if driver is None:
+            try:
+                return self.launch()
+            except Exception:
+                self.retire_slot()
+                raise
+
+        if not self.healthy(driver):
+            self.stats['unhealthy'] += 1
+            self.retire(driver)
+            return self.acquire(None if deadline is None else max(0, deadline - time.monotonic()))
+        return driver
+
+    def release(self, driver, failed=False):
+        self.page_counts[id(driver)] = self.page_counts.get(id(driver), 0) + 1
+        if failed or self.page_counts[id(driver)] >= self.max_pages:
+            self.stats['recycled'] += 1
+            self.retire(driver)
+            return
+        try:
+            # Drop page state so the next caller starts clean
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+        except WebDriverException:
+            self.retire(driver)
+            return
+        with self.available:
+            self.idle.append(driver)
+            self.available.notify()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        driver = self.acquire(timeout)
+        failed = False
+        try:
+            yield driver
+        except TimeoutException:
+            # A page that was slow to load or render says nothing about the browser
+            raise
+        except WebDriverException:
+            failed = True
+            raise
+        finally:
+            self.release(driver, failed)
+
+    def warm_up(self):
+        drivers = [self.acquire() for _ in range(self.size - len(self.idle))]
+        with self.available:
+            self.idle.extend(drivers)
+            self.available.notify_all()
+
+    def close(self):
+        while True:
+            with self.lock:
+                if not self.idle:
+                    break
+                driver = self.idle.pop()
+            self.retire(driver)
+
+
+def fetch_rendered(pool, url, selector=None, timeout=10):
+    with pool.driver() as driver:
+        driver.get(url)
+        wait_until_ready(driver, selector, timeout)
+        return driver.page_source
+
+
+TEST_PAGE = b"""<html><body><div id="app">Loading...</div>
+<script>
+setTimeout(function() {
+    var rows = '';
+    for (var i = 0; i < 200; i++) { rows += '<li class="item">Item ' + i + '</li>'; }
+    document.getElementById('app').innerHTML = '<ul id="ready">' + rows + '</ul>';
+}, 300);
+</script></body></html>"""
+
+
+class TestPageHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(TEST_PAGE)))
+        self.end_headers()
+        self.wfile.write(TEST_PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def benchmark(pages=20, pool_size=2):
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), TestPageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+
+    try:
+        # Baseline: fresh browser and a fixed sleep for every page
+        start = time.perf_counter()
+        for _ in range(pages):
+            driver = chrome_driver()
+            try:
+                driver.get(url)
+                time.sleep(2)
+                driver.page_source
+            finally:
+                driver.quit()
+        cold = time.perf_counter() - start
+
+        pool = DriverPool(size=pool_size)
+        pool.warm_up()
+        start = time.perf_counter()
+        threads = [threading.Thread(target=lambda: [fetch_rendered(pool, url, '#ready')
+                                                    for _ in range(pages // pool_size)])
+                   for _ in range(pool_size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pooled = time.perf_counter() - start
+        pool.close()
+    finally:
+        server.shutdown()
+
+    pooled_pages = pages // pool_size * pool_size
+    print(f"Cold launch + sleep(2): {pages / cold * 60:.1f} pages/min")
+    print(f"Warm pool ({pool_size} drivers): {pooled_pages / pooled * 60:.1f} pages/min")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the Selenium driver pool')
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--pool-size', type=int, default=2)
+    args = parser.parse_args()
+    benchmark(args.pages, args.pool_size)
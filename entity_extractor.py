@@ -0,0 +1,94 @@
+import re
+
+EMAIL_PATTERN = r'[\w\.-]+@[\w\.-]+\.\w+'
+PHONE_PATTERN = r'\+?\d{1,4}?[-.\s]?\(?\d{1,3}?\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}'
+
+# Emails are tried first at each position, so digits inside an address are not reported as phones
+ENTITY_RE = re.compile(rf'(?P<email>{EMAIL_PATTERN})|(?P<phone>{PHONE_PATTERN})')
+
+WHITESPACE_RE = re.compile(r'\s+')
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s@.-]')
+HTML_TAG_RE = re.compile(r'<[^<]+?>')
+
+# Characters that can never appear inside an email or phone match; safe places to split a stream
+BREAK_RE = re.compile(r'[^\w\s.@+()\-]')
+
+ENTITY_KINDS = ('email', 'phone')
+
+# Joins separate items; matched by BREAK_RE and by no entity pattern, so no match spans two items
+ITEM_SEPARATOR = '\x00'
+
+
+def collapse_whitespace(text):
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+def clean_text(text):
+    return SPECIAL_CHARS_RE.sub('', WHITESPACE_RE.sub(' ', text)).strip()
+
+
+def strip_html(text):
+    return HTML_TAG_RE.sub('', text)
+
+
+def iter_text(data):
+    # Yield the strings inside scraped data without stringifying whole containers
+    if isinstance(data, str):
+        yield data
+    elif isinstance(data, dict):
+        for value in data.values():
+            yield from iter_text(value)
+            yield ITEM_SEPARATOR
+    elif isinstance(data, (list, tuple)):
+        for item in data:
+            yield from iter_text(item)
+            yield ITEM_SEPARATOR
+    elif data is not None:
+        yield str(data)
+
+
+def iter_entities(chunks, overlap=256):
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk
+        limit = len(buffer) - overlap
+        if limit <= 0:
+            continue
+
+        # Matches ending before the overlap window cannot grow with more input
+        last_end = 0
+        pending = len(buffer)
+        for match in ENTITY_RE.finditer(buffer):
+            if match.end() > limit:
+                pending = match.start()
+                break
+            yield match.lastgroup, match.group()
+            last_end = match.end()
+
+        # Cut just after a character no entity can contain, so the carried tail rescans cleanly
+        end = min(limit, pending)
+        cut = max(last_end, end)
+        for boundary in BREAK_RE.finditer(buffer, max(last_end, end - overlap), end):
+            cut = boundary.end()
+        buffer = buffer[cut:]
+
+    for match in ENTITY_RE.finditer(buffer):
+        yield match.lastgroup, match.group()
+
+
+def extract_entities(data, kinds=ENTITY_KINDS):
+    chunks = [data] if isinstance(data, str) else data
+    results = {kind: [] for kind in kinds}
+    for kind, value in iter_entities(chunks):
+        if kind in results:
+            results[kind].append(value)
+    return results
+
+
+def iter_file_chunks(path, chunk_size=1024 * 1024, encoding='utf-8'):
+    with open(path, 'r', encoding=encoding, errors='replace') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
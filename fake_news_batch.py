@@ -0,0 +1,193 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from urllib.parse import urlparse
+
+import http_fetch
+from fake_news_detector import FakeNewsDetector
+
+
+class BulkNewsChecker:
+    def __init__(self, detector=None, concurrency=32, per_host=4, batch_size=16,
+                 timeout=10, db_path='news_feedback.db'):
+        self.detector = detector or FakeNewsDetector()
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.db_path = db_path
+        if db_path:
+            self.detector.init_database(db_path)
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+
+        # Pooled, retrying fetcher sized for the worker count
+        self.fetcher = http_fetch.Fetcher(timeout=timeout, per_host=per_host,
+                                          pool_size=concurrency)
+
+    def fetch_article(self, url):
+        response = self.fetcher.get(url, headers=self.headers)
+        response.raise_for_status()
+        return self.detector.parse_article(response.text)
+
+    async def fetch_worker(self, url_queue, text_queue, host_limits):
+        while True:
+            url = await url_queue.get()
+            if url is None:
+                url_queue.task_done()
+                break
+            host = urlparse(url).netloc.lower()
+            try:
+                async with host_limits[host]:
+                    text = await asyncio.to_thread(self.fetch_article, url)
+                if text:
+                    await text_queue.put((url, text, None))
+                else:
+                    await text_queue.put((url, None, 'No article text found'))
+            except Exception as e:
+                await text_queue.put((url, None, str(e)))
+            url_queue.task_done()
+
+    async def classify_batch(self, batch, writer):
+        texts = [text for _, text, _ in batch]
+        predictions = await asyncio.to_thread(self.detector.predict_batch, texts)
+        results = []
+        for (url, _, _), prediction in zip(batch, predictions):
+            results.append(self.make_result(url, prediction=prediction))
+        writer(results)
+        return results
+
+    def make_result(self, url, prediction=None, error=None):
+        result = {
+            'url': url,
+            'trust_score': self.detector.get_source_trust_score(url),
+            'timestamp': datetime.now().isoformat(),
+            'prediction': None,
+            'confidence': None,
+            'error': error
+        }
+        if prediction:
+            result['prediction'] = prediction['prediction']
+            result['confidence'] = prediction['confidence']
+        return result
+
+    async def check_urls_async(self, urls, jsonl_path=None):
+        url_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        text_queue = asyncio.Queue(maxsize=self.batch_size * 2)
+        host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        jsonl_file = open(jsonl_path, 'a', encoding='utf-8') if jsonl_path else None
+        stats = {'total': 0, 'classified': 0, 'failed': 0}
+
+        def write_results(results):
+            if jsonl_file:
+                for result in results:
+                    jsonl_file.write(json.dumps(result) + '\n')
+                jsonl_file.flush()
+            if self.db_path:
+                self.detector.save_batch_results(results, self.db_path)
+
+        async def feed():
+            for url in urls:
+                url = url.strip()
+                if url:
+                    stats['total'] += 1
+                    await url_queue.put(url)
+            for _ in range(self.concurrency):
+                await url_queue.put(None)
+
+        async def collect():
+            batch = []
+            failed = []
+            while True:
+                item = await text_queue.get()
+                if item is None:
+                    break
+                url, text, error = item
+                if error:
+                    failed.append(self.make_result(url, error=error))
+                    stats['failed'] += 1
+                    if len(failed) >= self.batch_size:
+                        write_results(failed)
+                        failed = []
+                    continue
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    stats['classified'] += len(await self.classify_batch(batch, write_results))
+                    batch = []
+            if batch:
+                stats['classified'] += len(await self.classify_batch(batch, write_results))
+            if failed:
+                write_results(failed)
+
+        start = time.perf_counter()
+        collector = asyncio.create_task(collect())
+        workers = [asyncio.create_task(self.fetch_worker(url_queue, text_queue, host_limits))
+                   for _ in range(self.concurrency)]
+
+        async def unless_collector_fails(awaitable):
+            # A dead collector would leave producers blocked on a full queue forever
+            task = asyncio.ensure_future(awaitable)
+            await asyncio.wait({task, collector}, return_when=asyncio.FIRST_COMPLETED)
+            if not task.done():
+                task.cancel()
+                collector.result()
+            return task.result()
+
+        try:
+            await unless_collector_fails(feed())
+            await unless_collector_fails(asyncio.gather(*workers))
+            await unless_collector_fails(text_queue.put(None))
+            await collector
+        finally:
+            for task in workers + [collector]:
+                task.cancel()
+            await asyncio.gather(*workers, collector, return_exceptions=True)
+            if jsonl_file:
+                jsonl_file.close()
+
+        elapsed = time.perf_counter() - start
+        stats['seconds'] = elapsed
+        stats['urls_per_minute'] = stats['total'] / elapsed * 60 if elapsed else 0.0
+        return stats
+
+    def check_urls(self, urls, jsonl_path=None):
+        return asyncio.run(self.check_urls_async(urls, jsonl_path))
+
+
+def check_urls(urls, jsonl_path=None, **options):
+    checker = BulkNewsChecker(**options)
+    return checker.check_urls(urls, jsonl_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Screen a list of news URLs for fake news')
+    parser.add_argument('input', help="File with one URL per line ('-' for stdin)")
+    parser.add_argument('--jsonl', help='Append results to this JSONL file')
+    parser.add_argument('--db', default='news_feedback.db',
+                        help="SQLite database for results ('' to disable)")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--per-host', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--timeout', type=float, default=10)
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    with source:
+        urls = source.read().splitlines()
+
+    stats = check_urls(urls, args.jsonl, concurrency=args.concurrency,
+                       per_host=args.per_host, batch_size=args.batch_size,
+                       timeout=args.timeout, db_path=args.db or None)
+
+    print(f"Processed {stats['total']} URLs in {stats['seconds']:.1f}s "
+          f"({stats['urls_per_minute']:.1f} URLs/min)")
+    print(f"Classified: {stats['classified']}  Failed: {stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import pandas as pd
 import numpy as np
 from lime.lime_text import LimeTextExplainer
-import requests
+import http_fetch
 from bs4 import BeautifulSoup
 import json
 import sqlite3
@@ -28,8 +28,8 @@ class FakeNewsDetector:
         # Initialize LIME explainer
         self.explainer = LimeTextExplainer(class_names=['Real', 'Fake'])
     
-    def init_database(self):
-        conn = sqlite3.connect('news_feedback.db')
+    def init_database(self, db_path='news_feedback.db'):
+        conn = sqlite3.connect(db_path)
         c = conn.cursor()
         c.execute('''
             CREATE TABLE IF NOT EXISTS feedback (
@@ -40,6 +40,17 @@ class FakeNewsDetector:
                 timestamp DATETIME
             )
         ''')
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS batch_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT,
+                prediction TEXT,
+                confidence REAL,
+                trust_score REAL,
+                error TEXT,
+                timestamp DATETIME
+            )
+        ''')
         conn.commit()
         conn.close()
     
@@ -58,45 +69,51 @@ class FakeNewsDetector:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove unwanted elements
-            for tag in soup(['script', 'style', 'nav', 'header', 'footer']):
-                tag.decompose()
-            
-            # Extract paragraphs
-            paragraphs = soup.find_all('p')
-            text = ' '.join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
-            
-            return text
+            response = http_fetch.get(url, headers=headers, timeout=10)
+            return self.parse_article(response.text)
         except Exception as e:
             st.error(f"Error extracting article: {str(e)}")
             return None
     
+    def parse_article(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Remove unwanted elements
+        for tag in soup(['script', 'style', 'nav', 'header', 'footer']):
+            tag.decompose()
+        
+        # Extract paragraphs
+        paragraphs = (p.get_text().strip() for p in soup.find_all('p'))
+        return ' '.join(p for p in paragraphs if p)
+    
     def get_source_trust_score(self, url):
         domain = urlparse(url).netloc.lower()
         base_domain = '.'.join(domain.split('.')[-2:])
         return self.source_trust_scores.get(base_domain, 0.5)
     
     def predict_fake_news(self, text):
-        # Tokenize and prepare input
-        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
+        return self.predict_batch([text])[0]
+    
+    def predict_batch(self, texts):
+        # Tokenize the whole batch at once, padded to the longest text
+        inputs = self.tokenizer(list(texts), return_tensors="pt", padding=True,
+                                truncation=True, max_length=512)
         
         # Get model prediction
         with torch.no_grad():
             outputs = self.model(**inputs)
             probabilities = torch.softmax(outputs.logits, dim=1)
         
-        # Get prediction and confidence
-        pred_class = torch.argmax(probabilities).item()
-        confidence = probabilities[0][pred_class].item()
-        
-        return {
-            'prediction': 'Fake' if pred_class == 1 else 'Real',
-            'confidence': confidence,
-            'probabilities': probabilities[0].tolist()
-        }
+        # Get prediction and confidence for each row
+        results = []
+        for row in probabilities:
+            pred_class = torch.argmax(row).item()
+            results.append({
+                'prediction': 'Fake' if pred_class == 1 else 'Real',
+                'confidence': row[pred_class].item(),
+                'probabilities': row.tolist()
+            })
+        return results
     
     def explain_prediction(self, text):
         def predict_proba(texts):
@@ -134,6 +151,17 @@ class FakeNewsDetector:
         ''', (url, prediction, user_feedback, datetime.now()))
         conn.commit()
         conn.close()
+    
+    def save_batch_results(self, results, db_path='news_feedback.db'):
+        conn = sqlite3.connect(db_path)
+        c = conn.cursor()
+        c.executemany('''
+            INSERT INTO batch_results (url, prediction, confidence, trust_score, error, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(r['url'], r.get('prediction'), r.get('confidence'), r.get('trust_score'),
+               r.get('error'), r['timestamp']) for r in results])
+        conn.commit()
+        conn.close()
 
 def main():
     st.title('🔍 Fake News Detector')
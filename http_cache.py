@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Headers worth keeping alongside a cached body
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Content-Language')
+
+
+class HTTPCache:
+    def __init__(self, cache_dir='.http_cache', max_bytes=200 * 1024 * 1024,
+                 db_path='scraper_history.db'):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.init_db()
+
+    def init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute('''CREATE TABLE IF NOT EXISTS http_cache
+                    (key TEXT PRIMARY KEY, url TEXT, etag TEXT, last_modified TEXT,
+                     headers TEXT, encoding TEXT, size INTEGER, last_access REAL)''')
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_http_cache_access
+                    ON http_cache (last_access)''')
+        c.execute('''CREATE TABLE IF NOT EXISTS http_cache_stats
+                    (day TEXT PRIMARY KEY, hits INTEGER DEFAULT 0,
+                     misses INTEGER DEFAULT 0, bytes_saved INTEGER DEFAULT 0)''')
+        conn.commit()
+        conn.close()
+
+    def key_for(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def body_path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def lookup(self, url):
+        key = self.key_for(url)
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute('''SELECT etag, last_modified, headers, encoding, size
+                              FROM http_cache WHERE key = ?''', (key,)).fetchone()
+        conn.close()
+        if row is None or not os.path.exists(self.body_path(key)):
+            return None
+        etag, last_modified, headers, encoding, size = row
+        return {
+            'key': key,
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': json.loads(headers),
+            'encoding': encoding,
+            'size': size
+        }
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def cacheable(self, response):
+        if response.status_code != 200:
+            return False
+        if 'no-store' in response.headers.get('Cache-Control', '').lower():
+            return False
+        return bool(response.headers.get('ETag') or response.headers.get('Last-Modified'))
+
+    def store(self, url, response):
+        key = self.key_for(url)
+        body = response.content
+        headers = {name: response.headers[name] for name in STORED_HEADERS
+                   if name in response.headers}
+
+        with self.lock:
+            with open(self.body_path(key), 'wb') as f:
+                f.write(body)
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('''INSERT OR REPLACE INTO http_cache
+                            (key, url, etag, last_modified, headers, encoding, size, last_access)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                         (key, url, response.headers.get('ETag'),
+                          response.headers.get('Last-Modified'), json.dumps(headers),
+                          response.encoding, len(body), time.time()))
+            conn.commit()
+            conn.close()
+            self.evict()
+
+    def evict(self):
+        # Drop least recently used bodies until the cache fits under max_bytes
+        conn = sqlite3.connect(self.db_path)
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM http_cache').fetchone()[0]
+        if total > self.max_bytes:
+            rows = conn.execute('SELECT key, size FROM http_cache ORDER BY last_access')
+            evicted = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                evicted.append(key)
+                total -= size
+            conn.executemany('DELETE FROM http_cache WHERE key = ?', [(k,) for k in evicted])
+            conn.commit()
+            for key in evicted:
+                try:
+                    os.remove(self.body_path(key))
+                except FileNotFoundError:
+                    pass
+        conn.close()
+
+    def cached_response(self, entry, revalidation):
+        # None when a concurrent eviction removed the body after lookup()
+        try:
+            with open(self.body_path(entry['key']), 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+
+        # The 304 may carry fresher validators than the stored copy
+        headers = CaseInsensitiveDict(entry['headers'])
+        for name in ('ETag', 'Last-Modified'):
+            if name in revalidation.headers:
+                headers[name] = revalidation.headers[name]
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = headers
+        response.encoding = entry['encoding']
+        response.url = entry['url']
+        response.request = revalidation.request
+        response.elapsed = revalidation.elapsed
+        response.from_cache = True
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''UPDATE http_cache SET etag = ?, last_modified = ?, last_access = ?
+                        WHERE key = ?''',
+                     (headers.get('ETag'), headers.get('Last-Modified'), time.time(),
+                      entry['key']))
+        conn.commit()
+        conn.close()
+        self.record(hit=True, bytes_saved=len(body))
+        return response
+
+    def record(self, hit, bytes_saved=0):
+        day = datetime.now().strftime("%Y-%m-%d")
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('INSERT OR IGNORE INTO http_cache_stats (day) VALUES (?)', (day,))
+        if hit:
+            conn.execute('''UPDATE http_cache_stats
+                            SET hits = hits + 1, bytes_saved = bytes_saved + ?
+                            WHERE day = ?''', (bytes_saved, day))
+        else:
+            conn.execute('UPDATE http_cache_stats SET misses = misses + 1 WHERE day = ?',
+                         (day,))
+        conn.commit()
+        conn.close()
+
+    def stats(self):
+        conn = sqlite3.connect(self.db_path)
+        hits, misses, bytes_saved = conn.execute('''
+            SELECT COALESCE(SUM(hits), 0), COALESCE(SUM(misses), 0),
+                   COALESCE(SUM(bytes_saved), 0)
+            FROM http_cache_stats''').fetchone()
+        entries, size = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache').fetchone()
+        conn.close()
+        return {'hits': hits, 'misses': misses, 'bytes_saved': bytes_saved,
+                'entries': entries, 'size': size}
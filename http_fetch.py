@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_cache import HTTPCache
+
+# urllib3 only decodes brotli bodies when one of these is installed
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+# (connect, read) timeout in seconds
+DEFAULT_TIMEOUT = (5, 20)
+
+
+class Fetcher:
+    def __init__(self, retries=3, backoff=0.5, timeout=DEFAULT_TIMEOUT,
+                 per_host=6, pool_size=32, headers=None, cache=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.per_host = per_host
+        self.headers = dict(DEFAULT_HEADERS)
+        if headers:
+            self.headers.update(headers)
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=retry)
+
+        # A single session keeps HTTP/1.1 connections alive between requests
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.host_limits = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def host_slot(self, url):
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            limit = self.host_limits.get(host)
+            if limit is None:
+                limit = threading.BoundedSemaphore(self.per_host)
+                self.host_limits[host] = limit
+        with limit:
+            yield
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        with self.host_slot(url):
+            return self.session.request(method, url, **kwargs)
+
+    def get(self, url, cache=None, **kwargs):
+        # Caching is per call: pass an HTTPCache, or construct the Fetcher with one
+        cache = cache if cache is not None else self.cache
+        if cache is None:
+            return self.request('GET', url, **kwargs)
+
+        # Revalidate cached copies with If-None-Match / If-Modified-Since
+        entry = cache.lookup(url)
+        request_kwargs = kwargs
+        if entry:
+            headers = dict(kwargs.get('headers') or {})
+            headers.update(cache.conditional_headers(entry))
+            request_kwargs = dict(kwargs, headers=headers)
+
+        response = self.request('GET', url, **request_kwargs)
+        if entry and response.status_code == 304:
+            cached = cache.cached_response(entry, response)
+            if cached is not None:
+                return cached
+            # The body was evicted while the request was in flight; fetch it in full
+            response = self.request('GET', url, **kwargs)
+
+        cache.record(hit=False)
+        if cache.cacheable(response):
+            cache.store(url, response)
+        return response
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    async def get_async(self, url, **kwargs):
+        return await asyncio.to_thread(self.get, url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_shared_fetcher = None
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_fetcher():
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = Fetcher()
+        return _shared_fetcher
+
+
+def get_cache():
+    # Created on first use, so callers that never opt in never touch the cache database
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = HTTPCache()
+        return _shared_cache
+
+
+def get(url, use_cache=False, **kwargs):
+    return get_fetcher().get(url, cache=get_cache() if use_cache else None, **kwargs)
+
+
+def post(url, **kwargs):
+    return get_fetcher().post(url, **kwargs)
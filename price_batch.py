@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import csv
+import statistics
+import time
+
+from store_adapters import get_stores, STORE_REGISTRY
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def read_products(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        rows = [row for row in reader if row and row[0].strip()]
+    if rows and rows[0][0].strip().lower() in ('product', 'name', 'product name'):
+        rows = rows[1:]
+    return [row[0].strip() for row in rows]
+
+
+async def fetch_matrix(products, stores, concurrency=8, timeout=8):
+    limit = asyncio.Semaphore(concurrency)
+
+    async def fetch(store, product):
+        async with limit:
+            return await asyncio.to_thread(store.fetch, product, HEADERS, timeout)
+
+    tasks = [fetch(store, product) for product in products for store in stores]
+    return await asyncio.gather(*tasks)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_stats(results, stores):
+    stats = {}
+    for store in stores:
+        rows = [r for r in results if r['store'] == store.name]
+        latencies = [r['latency'] for r in rows]
+        stats[store.name] = {
+            'requests': len(rows),
+            'found': sum(1 for r in rows if r['price'] is not None),
+            'mean': statistics.mean(latencies) if latencies else 0.0,
+            'p50': percentile(latencies, 50) if latencies else 0.0,
+            'p95': percentile(latencies, 95) if latencies else 0.0,
+            'max': max(latencies) if latencies else 0.0
+        }
+    return stats
+
+
+def write_matrix(path, products, stores, results):
+    prices = {(r['query'], r['store']): r['price'] for r in results}
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['product'] + [store.name for store in stores] + ['cheapest'])
+        for product in products:
+            row = [prices.get((product, store.name)) for store in stores]
+            found = [(price, store.name) for price, store in zip(row, stores) if price is not None]
+            cheapest = min(found)[1] if found else ''
+            writer.writerow([product] + ['' if p is None else p for p in row] + [cheapest])
+
+
+def run_batch(products, store_names=None, concurrency=8, timeout=8, output='price_matrix.csv'):
+    stores = get_stores(store_names)
+    start = time.perf_counter()
+    results = asyncio.run(fetch_matrix(products, stores, concurrency, timeout))
+    elapsed = time.perf_counter() - start
+    write_matrix(output, products, stores, results)
+    return results, latency_stats(results, stores), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare prices for a CSV of products across stores')
+    parser.add_argument('products', help='CSV file with product names in the first column')
+    parser.add_argument('--stores', help=f"Comma separated subset of: {', '.join(STORE_REGISTRY)}")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=8)
+    parser.add_argument('--output', default='price_matrix.csv')
+    args = parser.parse_args()
+
+    products = read_products(args.products)
+    store_names = [s.strip() for s in args.stores.split(',')] if args.stores else None
+    results, stats, elapsed = run_batch(products, store_names, args.concurrency,
+                                        args.timeout, args.output)
+
+    print(f"Fetched {len(results)} store x product prices in {elapsed:.1f}s -> {args.output}")
+    print(f"{'store':12s} {'found':>9s} {'mean':>7s} {'p50':>7s} {'p95':>7s} {'max':>7s}")
+    for name, s in stats.items():
+        print(f"{name:12s} {s['found']:>4d}/{s['requests']:<4d} {s['mean']:7.2f} "
+              f"{s['p50']:7.2f} {s['p95']:7.2f} {s['max']:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
 import tkinter as tk
-from tkinter import scrolledtext, ttk
-import requests
-from bs4 import BeautifulSoup
+from tkinter import scrolledtext, ttk, filedialog
+from store_adapters import get_stores
+from price_batch import read_products, run_batch
+import http_fetch
 import threading
+import time
 import json
 import re
-from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
 
 class PriceCompareBot:
     def __init__(self):
@@ -19,12 +21,20 @@ class PriceCompareBot:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        # Store URLs
-        self.stores = {
-            'amazon': 'https://www.amazon.in/s?k={}',
-            'flipkart': 'https://www.flipkart.com/search?q={}',
-            'bigbasket': 'https://www.bigbasket.com/ps/?q={}'
-        }
+        # Store adapters from the registry in store_adapters.py
+        self.stores = {store.name: store for store in get_stores()}
+        
+        # All stores are queried in parallel, each within the deadline
+        self.deadline = 8
+        # Interactive lookups never retry (a 503 with Retry-After would outlive the
+        # deadline); spare workers keep abandoned calls from starving the next search
+        self.fetcher = http_fetch.Fetcher(retries=0, pool_size=len(self.stores) * 4)
+        self.executor = ThreadPoolExecutor(max_workers=len(self.stores) * 4)
+        
+        # Recent query results, answered instantly while fresh
+        self.cache_ttl = 300
+        self.price_cache = {}
+        self.cache_lock = threading.Lock()
         
         self.create_gui()
         
@@ -54,6 +64,10 @@ class PriceCompareBot:
         search_button = ttk.Button(input_frame, text="Search", command=self.search_prices)
         search_button.pack(side=tk.LEFT, padx=5)
         
+        # Batch comparison from a CSV of product names
+        batch_button = ttk.Button(input_frame, text="Batch CSV", command=self.batch_compare)
+        batch_button.pack(side=tk.LEFT, padx=5)
+        
         # Progress bar
         self.progress = ttk.Progressbar(self.window, mode='indeterminate')
         
@@ -78,56 +92,91 @@ class PriceCompareBot:
         self.progress.start()
         
         # Start search in separate thread
-        threading.Thread(target=self.fetch_prices, args=(query,)).start()
+        threading.Thread(target=self.fetch_prices, args=(query,), daemon=True).start()
+        
+    def fetch_store(self, store, query, deadline_at):
+        adapter = self.stores[store]
+        # Timeouts come from what is left of the deadline, not a fresh allowance
+        remaining = max(0.5, deadline_at - time.monotonic())
+        return adapter.format_result(adapter.fetch(query, self.headers, remaining, self.fetcher))
+        
+    def get_cached(self, query):
+        with self.cache_lock:
+            entry = self.price_cache.get(query.lower())
+            if entry and time.time() - entry[0] < self.cache_ttl:
+                return entry[1]
+            self.price_cache.pop(query.lower(), None)
+        return None
         
     def fetch_prices(self, query):
-        results = []
+        cached = self.get_cached(query)
+        if cached is not None:
+            self.window.after(0, self.show_results, cached, True)
+            return
         
-        # Amazon
-        try:
-            url = self.stores['amazon'].format(quote(query))
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            price = soup.find('span', class_='a-price-whole')
-            if price:
-                results.append(f"Amazon: ₹{price.text.strip()}")
-        except:
-            results.append("Amazon: Price not found")
-            
-        # Flipkart
-        try:
-            url = self.stores['flipkart'].format(quote(query))
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            price = soup.find('div', class_='_30jeq3')
-            if price:
-                results.append(f"Flipkart: {price.text.strip()}")
-        except:
-            results.append("Flipkart: Price not found")
-            
-        # BigBasket
+        self.window.after(0, self.add_message, "\nPrice Comparison Results:")
+        deadline_at = time.monotonic() + self.deadline
+        futures = {self.executor.submit(self.fetch_store, store, query, deadline_at): store
+                   for store in self.stores}
+        results = []
         try:
-            url = self.stores['bigbasket'].format(quote(query))
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            price = soup.find('span', class_='Price')
-            if price:
-                results.append(f"BigBasket: {price.text.strip()}")
-        except:
-            results.append("BigBasket: Price not found")
-        
-        # Display results
-        self.window.after(0, self.show_results, results)
-        
-    def show_results(self, results):
+            # Show each store's answer as soon as it arrives
+            for future in as_completed(futures, timeout=self.deadline):
+                result = future.result()
+                results.append(result)
+                self.window.after(0, self.add_message, result)
+        except TimeoutError:
+            for future, store in futures.items():
+                if not future.done():
+                    future.cancel()
+                    result = f"{self.stores[store].label}: No response in {self.deadline}s"
+                    results.append(result)
+                    self.window.after(0, self.add_message, result)
+        else:
+            # Only cache complete answers
+            with self.cache_lock:
+                self.price_cache[query.lower()] = (time.time(), results)
+        
+        self.window.after(0, self.show_results, [])
+        
+    def show_results(self, results, cached=False):
         self.progress.stop()
         self.progress.pack_forget()
         
-        self.add_message("\nPrice Comparison Results:")
+        if cached:
+            self.add_message("\nPrice Comparison Results (cached):")
         for result in results:
             self.add_message(result)
         self.add_message("\nNote: Prices may vary based on location and availability.")
         
+    def batch_compare(self):
+        path = filedialog.askopenfilename(filetypes=[('CSV files', '*.csv')])
+        if not path:
+            return
+        output = filedialog.asksaveasfilename(defaultextension=".csv",
+                                              initialfile="price_matrix.csv",
+                                              filetypes=[('CSV files', '*.csv')])
+        if not output:
+            return
+        
+        products = read_products(path)
+        self.add_message(f"Bot: Comparing {len(products)} products across {len(self.stores)} stores...")
+        self.progress.pack(pady=10)
+        self.progress.start()
+        threading.Thread(target=self.run_batch, args=(products, output), daemon=True).start()
+        
+    def run_batch(self, products, output):
+        try:
+            results, stats, elapsed = run_batch(products, list(self.stores), timeout=self.deadline,
+                                                output=output)
+            lines = [f"\nBatch finished in {elapsed:.1f}s, price matrix saved to {output}"]
+            for name, s in stats.items():
+                lines.append(f"{self.stores[name].label}: {s['found']}/{s['requests']} found, "
+                             f"p50 {s['p50']:.2f}s, p95 {s['p95']:.2f}s")
+        except Exception as e:
+            lines = [f"Batch failed: {str(e)}"]
+        self.window.after(0, self.show_results, lines)
+        
     def run(self):
         self.window.mainloop()
 
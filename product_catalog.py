@@ -0,0 +1,126 @@
+import re
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+
+WORD_RE = re.compile(r'\w+')
+
+
+def trigrams(text):
+    # Per-word padded trigrams, so a typo in one word leaves the others intact
+    grams = set()
+    for word in WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class ProductCatalog:
+    def __init__(self, products=None, fuzzy_threshold=0.4, fuzzy_below=20):
+        self.products = {}
+        self.names = []     # sorted (lowercase name, name)
+        self.words = []     # sorted (lowercase word, name) for prefix matches inside names
+        self.grams = defaultdict(set)   # trigram -> names
+        self.gram_counts = {}
+        self.fuzzy_threshold = fuzzy_threshold
+        # Typo-tolerant matching only kicks in when prefixes find fewer results than this
+        self.fuzzy_below = fuzzy_below
+        if products:
+            self.sync(products)
+
+    def name_words(self, name):
+        return set(WORD_RE.findall(name.lower()))
+
+    def add(self, name, details, bulk=False):
+        self.products[name] = dict(details)
+        # Bulk loads append and sort once at the end instead of inserting in order
+        place = list.append if bulk else insort
+        place(self.names, (name.lower(), name))
+        for word in self.name_words(name):
+            place(self.words, (word, name))
+        grams = trigrams(name)
+        self.gram_counts[name] = len(grams)
+        for gram in grams:
+            self.grams[gram].add(name)
+
+    def remove(self, name):
+        del self.products[name]
+        del self.gram_counts[name]
+        del self.names[bisect_left(self.names, (name.lower(), name))]
+        for word in self.name_words(name):
+            del self.words[bisect_left(self.words, (word, name))]
+        for gram in trigrams(name):
+            self.grams[gram].discard(name)
+            if not self.grams[gram]:
+                del self.grams[gram]
+
+    def sync(self, products):
+        # Diff against the last snapshot; only names that changed are returned and touched
+        changed = set()
+        for name in list(self.products):
+            if name not in products:
+                self.remove(name)
+                changed.add(name)
+        added = [name for name in products if name not in self.products]
+        bulk = len(added) > 1000
+        for name in added:
+            self.add(name, products[name], bulk)
+        if bulk:
+            self.names.sort()
+            self.words.sort()
+        changed.update(added)
+        for name, details in products.items():
+            current = self.products[name]
+            if current != details:
+                current.update(details)
+                changed.add(name)
+        return changed
+
+    def range_matches(self, index, prefix):
+        start = bisect_left(index, (prefix,))
+        end = bisect_left(index, (prefix + '\uffff',))
+        return [name for _, name in index[start:end]]
+
+    def prefix_matches(self, query):
+        # Whole-name prefix first, then names with any word starting with a one-word query
+        query = query.lower()
+        matches = self.range_matches(self.names, query)
+        if ' ' not in query:
+            matches += sorted(self.range_matches(self.words, query), key=str.lower)
+        return list(dict.fromkeys(matches))
+
+    def fuzzy_matches(self, query):
+        # Names containing enough of the query's trigrams; best score, then shortest, first
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.grams.get(gram, ()))
+        scored = []
+        for name, count in shared.items():
+            score = count / len(query_grams)
+            if score >= self.fuzzy_threshold:
+                scored.append((-score, self.gram_counts[name], name))
+        return [name for _, _, name in sorted(scored)]
+
+    def search(self, query='', min_price=None, max_price=None, in_stock=False):
+        query = query.strip()
+        if query:
+            names = self.prefix_matches(query)
+            if len(names) < self.fuzzy_below:
+                seen = set(names)
+                names += [n for n in self.fuzzy_matches(query) if n not in seen]
+        else:
+            names = [name for _, name in self.names]
+
+        results = []
+        for name in names:
+            details = self.products[name]
+            if min_price is not None and details['price'] < min_price:
+                continue
+            if max_price is not None and details['price'] > max_price:
+                continue
+            if in_stock and details['stock'] <= 0:
+                continue
+            results.append(name)
+        return results
@@ -0,0 +1,114 @@
+import csv
+import json
+import re
+from itertools import islice
+
+POSITIVE_WORDS = ['good', 'great', 'excellent', 'amazing', 'perfect']
+NEGATIVE_WORDS = ['bad', 'poor', 'terrible', 'awful', 'horrible']
+
+# One compiled pass per review finds both polarities
+LEXICON_RE = re.compile(
+    r'\b(?:(?P<pos>' + '|'.join(POSITIVE_WORDS) + r')|(?P<neg>' + '|'.join(NEGATIVE_WORDS) + r'))\b',
+    re.IGNORECASE
+)
+
+
+def lexicon_score(text):
+    positive = negative = 0
+    for match in LEXICON_RE.finditer(text):
+        if match.lastgroup == 'pos':
+            positive += 1
+        else:
+            negative += 1
+    return positive, negative
+
+
+def load_model(name='distilbert-base-uncased-finetuned-sst-2-english'):
+    # Optional: falls back to the lexicon when transformers is not installed
+    try:
+        from transformers import pipeline
+    except ImportError:
+        return None
+    return pipeline('sentiment-analysis', model=name, truncation=True)
+
+
+def iter_chunks(items, size):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_reviews_file(path):
+    # One review per line; JSONL lines may carry the text under "review" or "text"
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                record = json.loads(line)
+                yield record.get('review') or record.get('text') or ''
+            else:
+                yield line
+
+
+class SentimentAggregate:
+    def __init__(self):
+        self.counts = {'Positive': 0, 'Negative': 0}
+        self.total = 0
+        self.score_sum = 0.0
+
+    def add(self, label, score):
+        self.counts[label] += 1
+        self.total += 1
+        self.score_sum += score
+
+    @property
+    def mean_score(self):
+        return self.score_sum / self.total if self.total else 0.0
+
+
+class ReviewScorer:
+    def __init__(self, model=None, chunk_size=5000, model_batch_size=32):
+        self.model = model
+        self.chunk_size = chunk_size
+        self.model_batch_size = model_batch_size
+
+    def score_chunk(self, chunk):
+        if self.model is not None:
+            rows = []
+            outputs = self.model(chunk, batch_size=self.model_batch_size)
+            for output in outputs:
+                positive = output['label'].upper().startswith('POS')
+                score = output['score'] if positive else -output['score']
+                rows.append((None, None, score, 'Positive' if positive else 'Negative'))
+            return rows
+
+        rows = []
+        for review in chunk:
+            positive, negative = lexicon_score(review)
+            total = positive + negative
+            score = (positive - negative) / total if total else 0.0
+            rows.append((positive, negative, score,
+                         'Positive' if positive > negative else 'Negative'))
+        return rows
+
+    def score(self, reviews, output_path, on_chunk=None):
+        aggregate = SentimentAggregate()
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['review_id', 'positive', 'negative', 'score', 'label'])
+            review_id = 0
+            # Only one chunk of reviews is held at a time; scores go straight to disk
+            for chunk in iter_chunks(reviews, self.chunk_size):
+                for positive, negative, score, label in self.score_chunk(chunk):
+                    writer.writerow([review_id, positive, negative, f"{score:.4f}", label])
+                    aggregate.add(label, score)
+                    review_id += 1
+                f.flush()
+                if on_chunk:
+                    on_chunk(aggregate)
+        return aggregate
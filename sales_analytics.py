@@ -0,0 +1,115 @@
+import pandas as pd
+
+from table_ingest import parquet_columns, load_columns
+
+# Column roles and the name fragments that identify them, checked once per dataset
+COLUMN_ROLES = {
+    'date': ('date',),
+    'sales': ('sale', 'amount'),
+    'product': ('product',),
+    'category': ('category',)
+}
+
+
+def find_columns(columns):
+    roles = {}
+    for column in columns:
+        name = str(column).lower()
+        for role, fragments in COLUMN_ROLES.items():
+            if role not in roles and any(f in name for f in fragments):
+                roles[role] = column
+    return roles
+
+
+def to_number(series):
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    cleaned = series.astype(str).str.replace(r'[^\d.\-]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+class SalesAnalytics:
+    def __init__(self, df, loader=None):
+        self.roles = find_columns(df.columns)
+        self.loader = loader
+        self.df = self.normalize(df)
+        self.cache = {}
+
+    @classmethod
+    def from_parquet(cls, path):
+        # Load only the role columns; anything else is read on demand
+        roles = find_columns(parquet_columns(path))
+        df = load_columns(path, dict.fromkeys(roles.values()))
+        return cls(df, loader=lambda columns: load_columns(path, columns))
+
+    def frame(self, columns):
+        missing = [c for c in dict.fromkeys(columns) if c not in self.df.columns]
+        if missing and self.loader:
+            self.df = pd.concat([self.df, self.loader(missing)], axis=1)
+        return self.df[list(columns)]
+
+    def normalize(self, df):
+        # Convert column types once so every analysis works on typed columns
+        df = df.copy()
+        if 'date' in self.roles:
+            df[self.roles['date']] = pd.to_datetime(df[self.roles['date']], errors='coerce')
+        if 'sales' in self.roles:
+            df[self.roles['sales']] = to_number(df[self.roles['sales']])
+        for role in ('product', 'category'):
+            if role in self.roles:
+                df[self.roles[role]] = df[self.roles[role]].astype('category')
+        return df
+
+    def column(self, role):
+        if role not in self.roles:
+            raise ValueError(f"No {role} column found in the scraped table")
+        return self.roles[role]
+
+    def cached(self, key, compute):
+        if key not in self.cache:
+            self.cache[key] = compute()
+        return self.cache[key]
+
+    def monthly_sales(self):
+        def compute():
+            dates = self.df[self.column('date')]
+            sales = self.df[self.column('sales')]
+            monthly = sales.groupby(dates.dt.to_period('M')).sum()
+            monthly.index = monthly.index.astype(str)
+            return monthly
+        return self.cached('monthly_sales', compute)
+
+    def product_totals(self):
+        def compute():
+            sales = self.df[self.column('sales')]
+            totals = sales.groupby(self.df[self.column('product')], observed=True).sum()
+            return totals.sort_values(ascending=False)
+        return self.cached('product_totals', compute)
+
+    def top_products(self, n=10):
+        return self.product_totals().head(n)
+
+    def category_counts(self):
+        return self.cached('category_counts',
+                           lambda: self.df[self.column('category')].value_counts())
+
+    def trend(self, x_col, y_col):
+        def compute():
+            data = self.frame([x_col, y_col]).dropna()
+            if x_col != y_col:
+                data = data.sort_values(x_col)
+            return data
+        return self.cached(('trend', x_col, y_col), compute)
+
+    def summary(self):
+        def compute():
+            # All sales aggregates in one reduction
+            sales = self.df[self.column('sales')]
+            stats = sales.agg(['count', 'sum', 'mean', 'median', 'min', 'max', 'std'])
+            summary = stats.to_dict()
+            if 'date' in self.roles:
+                dates = self.df[self.roles['date']]
+                summary['first_date'] = dates.min()
+                summary['last_date'] = dates.max()
+            return summary
+        return self.cached('summary', compute)
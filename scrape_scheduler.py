@@ -0,0 +1,284 @@
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import http_fetch
+from change_detector import ChangeDetector
+from dom_extractor import make_soup, extract_single_pass
+from stream_export import export_records, iter_records
+
+SCRAPE_OPTIONS = ["Tables", "Links", "Images", "Text"]
+
+
+def fetch_page(url, headers=None):
+    response = http_fetch.get(url, use_cache=True, headers=headers)
+    response.raise_for_status()
+    return response
+
+
+def parse_page(html, options):
+    soup = make_soup(html)
+    return extract_single_pass(
+        soup,
+        tables="Tables" in options,
+        links="Links" in options,
+        images="Images" in options,
+        text="Text" in options
+    )
+
+
+class ScrapeScheduler:
+    def __init__(self, db_path='scraper_history.db', workers=4, poll_interval=5,
+                 output_dir='exports', policy='coalesce'):
+        self.db_path = db_path
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.output_dir = output_dir
+        self.policy = policy
+        self.running = set()
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.executor = None
+        self.detector = ChangeDetector(db_path)
+        self.logger = logging.getLogger(__name__)
+        self.init_db()
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_db(self):
+        conn = self.connect()
+        c = conn.cursor()
+        c.execute('''CREATE TABLE IF NOT EXISTS scrape_jobs
+                    (id INTEGER PRIMARY KEY, url TEXT, options TEXT, headers TEXT,
+                     daily_at TEXT, every_minutes INTEGER, email TEXT,
+                     next_run TEXT, enabled INTEGER DEFAULT 1, created TEXT)''')
+        c.execute('''CREATE TABLE IF NOT EXISTS scrape_runs
+                    (id INTEGER PRIMARY KEY, job_id INTEGER, started TEXT, duration REAL,
+                     bytes INTEGER, status TEXT, error TEXT, output TEXT,
+                     added INTEGER, changed INTEGER, removed INTEGER)''')
+        # Databases created before change detection lack the delta columns
+        for column in ('added', 'changed', 'removed'):
+            try:
+                c.execute(f'ALTER TABLE scrape_runs ADD COLUMN {column} INTEGER')
+            except sqlite3.OperationalError:
+                pass
+        c.execute('CREATE INDEX IF NOT EXISTS idx_scrape_jobs_next ON scrape_jobs (enabled, next_run)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_scrape_runs_job ON scrape_runs (job_id, started)')
+        conn.commit()
+        conn.close()
+
+    def next_run_after(self, daily_at, every_minutes, now):
+        if every_minutes:
+            return now + timedelta(minutes=every_minutes)
+        hour, minute = map(int, daily_at.split(':'))
+        run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return run_at
+
+    def add_job(self, url, options, daily_at=None, every_minutes=None, email=None, headers=None):
+        if not daily_at and not every_minutes:
+            raise ValueError("A job needs either daily_at (HH:MM) or every_minutes")
+        now = datetime.now()
+        next_run = self.next_run_after(daily_at, every_minutes, now)
+        conn = self.connect()
+        c = conn.cursor()
+        c.execute('''INSERT INTO scrape_jobs
+                     (url, options, headers, daily_at, every_minutes, email, next_run, created)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                  (url, json.dumps(list(options)), json.dumps(headers) if headers else None,
+                   daily_at, every_minutes, email, next_run.isoformat(), now.isoformat()))
+        job_id = c.lastrowid
+        conn.commit()
+        conn.close()
+        return job_id
+
+    def remove_job(self, job_id):
+        conn = self.connect()
+        conn.execute('UPDATE scrape_jobs SET enabled = 0 WHERE id = ?', (job_id,))
+        conn.commit()
+        conn.close()
+
+    def get_job(self, job_id):
+        conn = self.connect()
+        row = conn.execute('SELECT * FROM scrape_jobs WHERE id = ? AND enabled = 1', (job_id,)).fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def list_jobs(self):
+        conn = self.connect()
+        rows = [dict(r) for r in conn.execute('SELECT * FROM scrape_jobs WHERE enabled = 1 ORDER BY next_run')]
+        conn.close()
+        return rows
+
+    def claim_due_jobs(self, now):
+        # Advance next_run before dispatching so a slow run is never picked up twice
+        conn = self.connect()
+        jobs = [dict(r) for r in conn.execute(
+            'SELECT * FROM scrape_jobs WHERE enabled = 1 AND next_run <= ?', (now.isoformat(),))]
+        conn.executemany('UPDATE scrape_jobs SET next_run = ? WHERE id = ?',
+                         [(self.next_run_after(j['daily_at'], j['every_minutes'], now).isoformat(),
+                           j['id']) for j in jobs])
+        conn.commit()
+        conn.close()
+        return jobs
+
+    def record_run(self, job_id, started, duration, size, status, error=None, output=None,
+                   changes=None):
+        counts = [len(changes[k]) if changes else None for k in ('added', 'changed', 'removed')]
+        conn = self.connect()
+        conn.execute('''INSERT INTO scrape_runs
+                        (job_id, started, duration, bytes, status, error, output,
+                         added, changed, removed)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                     (job_id, started.isoformat(), duration, size, status, error, output, *counts))
+        conn.commit()
+        conn.close()
+
+    def dispatch(self, now):
+        for job in self.claim_due_jobs(now):
+            with self.lock:
+                busy = job['id'] in self.running
+                if busy and self.policy == 'coalesce':
+                    # Any number of missed triggers collapse into one follow-up run
+                    self.pending.add(job['id'])
+                elif not busy:
+                    self.running.add(job['id'])
+            if busy:
+                if self.policy == 'skip':
+                    self.record_run(job['id'], now, 0.0, 0, 'skipped',
+                                    'Previous run still in progress')
+                continue
+            self.submit(job)
+
+    def submit(self, job):
+        future = self.executor.submit(self.execute, job)
+        future.add_done_callback(lambda f, job=job: self.finished(job))
+
+    def finished(self, job):
+        with self.lock:
+            rerun = job['id'] in self.pending
+            self.pending.discard(job['id'])
+            if not rerun:
+                self.running.discard(job['id'])
+        if rerun:
+            # Catch-up runs use the job as stored now; it may have been edited or removed
+            current = self.get_job(job['id'])
+            if current is None:
+                with self.lock:
+                    self.running.discard(job['id'])
+                return
+            self.submit(current)
+
+    def execute(self, job):
+        started = datetime.now()
+        start = time.perf_counter()
+        size = 0
+        try:
+            headers = json.loads(job['headers']) if job['headers'] else None
+            response = fetch_page(job['url'], headers)
+            body = response.content
+            size = len(body)
+
+            # Identical page bytes: nothing downstream needs to run
+            scope = f"job:{job['id']}"
+            if not self.detector.page_changed(job['url'], body, scope):
+                self.record_run(job['id'], started, time.perf_counter() - start, size, 'unchanged')
+                return
+
+            data = parse_page(response.text, json.loads(job['options']))
+            changes = self.detector.diff(job['url'], iter_records(data), body, scope)
+
+            # Only the delta is written for consumers
+            output = os.path.join(self.output_dir,
+                                  f"job_{job['id']}_{started.strftime('%Y%m%d_%H%M%S')}.jsonl")
+            export_records(self.iter_changes(changes), output, 'jsonl')
+            self.record_run(job['id'], started, time.perf_counter() - start, size, 'success',
+                            output=output, changes=changes)
+            self.notify(job, "Scraping completed successfully!")
+        except Exception as e:
+            self.logger.error(f"Job {job['id']} failed: {str(e)}")
+            self.record_run(job['id'], started, time.perf_counter() - start, size, 'failed',
+                            str(e))
+            self.notify(job, f"Scraping failed: {str(e)}")
+
+    def iter_changes(self, changes):
+        for change in ('added', 'changed'):
+            for record in changes[change]:
+                yield dict(record, change=change)
+        for key in changes['removed']:
+            yield {'change': 'removed', 'key': key}
+
+    def notify(self, job, message):
+        # Email delivery depends on your mail service configuration
+        if job['email']:
+            self.logger.info(f"Notify {job['email']} about job {job['id']}: {message}")
+
+    def run_forever(self):
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.logger.info(f"Scheduler started with {self.workers} workers")
+        try:
+            while True:
+                self.dispatch(datetime.now())
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            self.logger.info("Scheduler stopping")
+        finally:
+            self.executor.shutdown(wait=True)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Persistent scheduler for scraping jobs')
+    parser.add_argument('--db', default='scraper_history.db')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='Run the scheduler daemon')
+    run.add_argument('--workers', type=int, default=4)
+    run.add_argument('--poll', type=float, default=5)
+    run.add_argument('--policy', choices=['coalesce', 'skip'], default='coalesce')
+
+    add = sub.add_parser('add', help='Add a scraping job')
+    add.add_argument('url')
+    add.add_argument('--options', default='Text', help=f"Comma separated: {', '.join(SCRAPE_OPTIONS)}")
+    add.add_argument('--daily', help='Run daily at HH:MM')
+    add.add_argument('--every', type=int, help='Run every N minutes')
+    add.add_argument('--email')
+
+    sub.add_parser('list', help='List active jobs')
+
+    remove = sub.add_parser('remove', help='Disable a job')
+    remove.add_argument('job_id', type=int)
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        ScrapeScheduler(args.db, workers=args.workers, poll_interval=args.poll,
+                        policy=args.policy).run_forever()
+        return
+
+    scheduler = ScrapeScheduler(args.db)
+    if args.command == 'add':
+        options = [o.strip() for o in args.options.split(',') if o.strip()]
+        job_id = scheduler.add_job(args.url, options, args.daily, args.every, args.email)
+        print(f"Added job {job_id}")
+    elif args.command == 'list':
+        for job in scheduler.list_jobs():
+            when = f"daily at {job['daily_at']}" if job['daily_at'] else f"every {job['every_minutes']} min"
+            print(f"{job['id']}: {job['url']} ({when}) next run {job['next_run']}")
+    elif args.command == 'remove':
+        scheduler.remove_job(args.job_id)
+        print(f"Disabled job {args.job_id}")
+
+
+if __name__ == "__main__":
+    main()
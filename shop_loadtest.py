@@ -0,0 +1,133 @@
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from shop_store import ShopStore
+from shop_service import ShopService, Cart
+
+
+def seed(store, products, stock, customers):
+    catalog = {f"product-{i:04d}": stock for i in range(products)}
+    for name, units in catalog.items():
+        store.upsert_product(name, round(random.uniform(1, 500), 2), units)
+    names = [f"customer-{i:04d}" for i in range(customers)]
+    for name in names:
+        store.add_user(name, 'secret', 'customer')
+    return catalog, names
+
+
+def customer_session(service, customer, orders, products, max_lines, max_quantity, seed_value, start):
+    rng = random.Random(seed_value)
+    latencies = []
+    placed = rejected = 0
+    start.wait()
+    for _ in range(orders):
+        cart = Cart()
+        for product in rng.sample(products, rng.randint(1, max_lines)):
+            service.add_to_cart(cart, product, rng.randint(1, max_quantity))
+        began = time.perf_counter()
+        try:
+            service.checkout(customer, cart)
+            placed += 1
+        except ValueError:
+            rejected += 1
+        latencies.append(time.perf_counter() - began)
+    return latencies, placed, rejected
+
+
+def find_oversells(store, initial, sold_before=None):
+    # Stock must never go negative and must equal the starting stock minus units sold
+    # during this run; a reused database also holds order items from earlier runs
+    sold_before = sold_before or {}
+    sold_after = store.get_units_sold()
+    violations = []
+    for name, details in store.get_products().items():
+        if name not in initial:
+            continue
+        sold = sold_after.get(name, 0) - sold_before.get(name, 0)
+        expected = initial[name] - sold
+        if details['stock'] < 0 or details['stock'] != expected:
+            violations.append((name, initial[name], sold, details['stock']))
+    return violations
+
+
+def run_load_test(db_path, customers=50, orders=20, products=25, stock=100,
+                  max_lines=3, max_quantity=3, seed_value=0):
+    random.seed(seed_value)
+    store = ShopStore(db_path, import_legacy=False)
+    service = ShopService(store)
+    initial, names = seed(store, products, stock, customers)
+    sold_before = store.get_units_sold()
+    product_names = list(initial)
+
+    # All customers start checking out at the same moment
+    start = threading.Barrier(customers)
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=customers) as executor:
+        futures = [executor.submit(customer_session, service, name, orders, product_names,
+                                   max_lines, max_quantity, seed_value + i, start)
+                   for i, name in enumerate(names)]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - began
+
+    latencies = [latency for session, _, _ in results for latency in session]
+    placed = sum(p for _, p, _ in results)
+    rejected = sum(r for _, _, r in results)
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        p50, p99 = cuts[49], cuts[98]
+    else:
+        p50 = p99 = latencies[0] if latencies else 0.0
+    return {
+        'checkouts': len(latencies),
+        'placed': placed,
+        'rejected': rejected,
+        'elapsed': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': p50 * 1000,
+        'p99_ms': p99 * 1000,
+        'oversells': find_oversells(store, initial, sold_before)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test concurrent checkouts against the shop store')
+    parser.add_argument('--customers', type=int, default=50, help='Concurrent customers')
+    parser.add_argument('--orders', type=int, default=20, help='Orders per customer')
+    parser.add_argument('--products', type=int, default=25)
+    parser.add_argument('--stock', type=int, default=100, help='Starting stock per product')
+    parser.add_argument('--max-lines', type=int, default=3, help='Most products in one cart')
+    parser.add_argument('--max-quantity', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--db', help='Database to use; defaults to a throwaway file')
+    args = parser.parse_args()
+
+    tmp_dir = None
+    db_path = args.db
+    if db_path is None:
+        tmp_dir = tempfile.mkdtemp(prefix='shop_loadtest_')
+        db_path = os.path.join(tmp_dir, 'shopping.db')
+    try:
+        result = run_load_test(db_path, args.customers, args.orders, args.products, args.stock,
+                               args.max_lines, args.max_quantity, args.seed)
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"{result['checkouts']} checkouts by {args.customers} customers in {result['elapsed']:.2f}s")
+    print(f"Throughput: {result['throughput']:.1f} checkouts/s "
+          f"({result['placed']} placed, {result['rejected']} rejected for stock)")
+    print(f"Latency: p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms")
+    print(f"Oversell violations: {len(result['oversells'])}")
+    for name, initial, sold, stock in result['oversells']:
+        print(f"  {name}: started {initial}, sold {sold}, stock now {stock}")
+
+
+if __name__ == "__main__":
+    main()
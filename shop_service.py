@@ -0,0 +1,52 @@
+from shop_store import ShopStore
+
+
+class Cart:
+    def __init__(self):
+        self.items = {}
+
+    def add(self, product, price, quantity=1):
+        if product in self.items:
+            self.items[product]['quantity'] += quantity
+        else:
+            self.items[product] = {'quantity': quantity, 'price': float(price)}
+
+    def remove(self, product):
+        self.items.pop(product, None)
+
+    def clear(self):
+        self.items = {}
+
+    def total(self):
+        return sum(item['price'] * item['quantity'] for item in self.items.values())
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+class ShopService:
+    # Cart and checkout rules with no Tk dependency; the GUI and the load test both use it
+    def __init__(self, store=None):
+        self.store = store or ShopStore()
+
+    def authenticate(self, username, password):
+        user = self.store.get_user(username)
+        if user and user['password'] == password:
+            return user
+        return None
+
+    def register(self, username, password, user_type):
+        return self.store.add_user(username, password, user_type)
+
+    def add_to_cart(self, cart, product, quantity=1):
+        details = self.store.get_product(product)
+        if details is None:
+            raise ValueError(f"Unknown product: {product}")
+        cart.add(product, details['price'], quantity)
+
+    def checkout(self, customer, cart):
+        if not cart:
+            raise ValueError("Cart is empty!")
+        order_id = self.store.place_order(customer, cart.items)
+        cart.clear()
+        return order_id
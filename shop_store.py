@@ -0,0 +1,256 @@
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+
+
+class ShopStore:
+    def __init__(self, db_path='shopping.db', timeout=30, import_legacy=True):
+        self.db_path = db_path
+        self.timeout = timeout
+        # Whether a fresh database picks up users/products/orders JSON from the CWD
+        self.import_legacy = import_legacy
+        self.init_db()
+
+    def connect(self):
+        # Autocommit mode so each write path opens its own explicit transaction
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        conn.execute('PRAGMA foreign_keys = ON')
+        return conn
+
+    def init_db(self):
+        conn = self.connect()
+        # WAL lets readers (product list, order view) run while a checkout commits
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS users
+                (username TEXT PRIMARY KEY, password TEXT NOT NULL, type TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS products
+                (name TEXT PRIMARY KEY, price REAL NOT NULL,
+                 stock INTEGER NOT NULL CHECK (stock >= 0));
+            CREATE TABLE IF NOT EXISTS orders
+                (id TEXT PRIMARY KEY, customer TEXT NOT NULL REFERENCES users(username),
+                 date TEXT NOT NULL, status TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS order_items
+                (order_id TEXT NOT NULL REFERENCES orders(id), product TEXT NOT NULL,
+                 quantity INTEGER NOT NULL CHECK (quantity > 0), price REAL NOT NULL,
+                 PRIMARY KEY (order_id, product));
+            CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer);
+            CREATE INDEX IF NOT EXISTS idx_orders_date ON orders(date);
+            CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+            CREATE INDEX IF NOT EXISTS idx_order_items_product ON order_items(product);
+            CREATE TABLE IF NOT EXISTS daily_revenue
+                (day TEXT PRIMARY KEY, revenue REAL NOT NULL, orders INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS product_sales
+                (product TEXT PRIMARY KEY, units INTEGER NOT NULL, revenue REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS idx_product_sales_units ON product_sales(units);
+            CREATE TABLE IF NOT EXISTS order_status_counts
+                (status TEXT PRIMARY KEY, orders INTEGER NOT NULL);
+        ''')
+        if self.import_legacy and conn.execute('SELECT COUNT(*) FROM users').fetchone()[0] == 0:
+            self.import_json(conn)
+        if conn.execute('SELECT COUNT(*) FROM order_status_counts').fetchone()[0] == 0:
+            self.rebuild_aggregates(conn)
+        conn.close()
+
+    def rebuild_aggregates(self, conn):
+        # Full recount, only needed for orders written before the aggregates existed
+        conn.execute('BEGIN')
+        conn.execute('DELETE FROM daily_revenue')
+        conn.execute('DELETE FROM product_sales')
+        conn.execute('DELETE FROM order_status_counts')
+        conn.execute('''INSERT INTO daily_revenue
+                        SELECT substr(o.date, 1, 10), SUM(i.quantity * i.price), COUNT(DISTINCT o.id)
+                        FROM orders o JOIN order_items i ON i.order_id = o.id
+                        GROUP BY substr(o.date, 1, 10)''')
+        conn.execute('''INSERT INTO product_sales
+                        SELECT product, SUM(quantity), SUM(quantity * price)
+                        FROM order_items GROUP BY product''')
+        conn.execute('''INSERT INTO order_status_counts
+                        SELECT status, COUNT(*) FROM orders GROUP BY status''')
+        conn.execute('COMMIT')
+
+    def add_to_aggregates(self, conn, date, items):
+        # Runs inside the checkout transaction, so aggregates always match the orders
+        revenue = sum(quantity * price for _, quantity, price in items)
+        conn.execute('INSERT INTO daily_revenue VALUES (?, ?, 1) ON CONFLICT(day) DO UPDATE '
+                     'SET revenue = revenue + excluded.revenue, orders = orders + 1',
+                     (date[:10], revenue))
+        conn.executemany('INSERT INTO product_sales VALUES (?, ?, ?) ON CONFLICT(product) DO UPDATE '
+                         'SET units = units + excluded.units, revenue = revenue + excluded.revenue',
+                         [(product, quantity, quantity * price) for product, quantity, price in items])
+        self.count_status(conn, 'pending', 1)
+
+    def count_status(self, conn, status, delta):
+        conn.execute('INSERT INTO order_status_counts VALUES (?, ?) ON CONFLICT(status) DO UPDATE '
+                     'SET orders = orders + excluded.orders', (status, delta))
+
+    def import_json(self, conn, users_file='users.json', products_file='products.json',
+                    orders_file='orders.json'):
+        # One-time migration from the JSON files the platform used before
+        def read(path, default):
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    return json.load(f)
+            return default
+
+        users = read(users_file, {'admin': {'password': 'admin123', 'type': 'seller'}})
+        products = read(products_file, {})
+        orders = read(orders_file, {})
+        conn.execute('BEGIN')
+        conn.executemany('INSERT OR IGNORE INTO users VALUES (?, ?, ?)',
+                         [(name, u['password'], u['type']) for name, u in users.items()])
+        conn.executemany('INSERT OR REPLACE INTO products VALUES (?, ?, ?)',
+                         [(name, float(p['price']), max(int(p['stock']), 0))
+                          for name, p in products.items()])
+        for order_id, order in orders.items():
+            conn.execute('INSERT OR IGNORE INTO users VALUES (?, ?, ?)',
+                         (order['customer'], '', 'customer'))
+            conn.execute('INSERT OR IGNORE INTO orders VALUES (?, ?, ?, ?)',
+                         (order_id, order['customer'], order['date'], order['status']))
+            conn.executemany('INSERT OR IGNORE INTO order_items VALUES (?, ?, ?, ?)',
+                             [(order_id, product, item['quantity'], item['price'])
+                              for product, item in order['items'].items()])
+        conn.execute('COMMIT')
+
+    def get_user(self, username):
+        conn = self.connect()
+        row = conn.execute('SELECT password, type FROM users WHERE username = ?',
+                           (username,)).fetchone()
+        conn.close()
+        return {'password': row[0], 'type': row[1]} if row else None
+
+    def add_user(self, username, password, user_type):
+        conn = self.connect()
+        cursor = conn.execute('INSERT OR IGNORE INTO users VALUES (?, ?, ?)',
+                              (username, password, user_type))
+        conn.close()
+        return cursor.rowcount == 1
+
+    def get_products(self):
+        conn = self.connect()
+        rows = conn.execute('SELECT name, price, stock FROM products ORDER BY name').fetchall()
+        conn.close()
+        return {name: {'price': price, 'stock': stock} for name, price, stock in rows}
+
+    def get_product(self, name):
+        conn = self.connect()
+        row = conn.execute('SELECT price, stock FROM products WHERE name = ?', (name,)).fetchone()
+        conn.close()
+        return {'price': row[0], 'stock': row[1]} if row else None
+
+    def upsert_product(self, name, price, stock):
+        conn = self.connect()
+        conn.execute('INSERT INTO products (name, price, stock) VALUES (?, ?, ?) '
+                     'ON CONFLICT(name) DO UPDATE SET price = excluded.price, stock = excluded.stock',
+                     (name, float(price), int(stock)))
+        conn.close()
+
+    def get_orders(self, customer=None):
+        conn = self.connect()
+        query = 'SELECT id, customer, date, status FROM orders'
+        params = ()
+        if customer:
+            query += ' WHERE customer = ?'
+            params = (customer,)
+        rows = conn.execute(query + ' ORDER BY date', params).fetchall()
+        conn.close()
+        return {order_id: {'customer': c, 'date': d, 'status': s} for order_id, c, d, s in rows}
+
+    def get_units_sold(self):
+        conn = self.connect()
+        rows = conn.execute('SELECT product, SUM(quantity) FROM order_items GROUP BY product').fetchall()
+        conn.close()
+        return dict(rows)
+
+    def get_orders_since(self, last_rowid=0):
+        # Orders are append-only, so the rowid is a cursor over the order stream
+        conn = self.connect()
+        rows = conn.execute('SELECT rowid, id, customer, date, status FROM orders '
+                            'WHERE rowid > ? ORDER BY rowid', (last_rowid,)).fetchall()
+        conn.close()
+        orders = {order_id: {'customer': c, 'date': d, 'status': s} for _, order_id, c, d, s in rows}
+        return orders, (rows[-1][0] if rows else last_rowid)
+
+    def set_order_status(self, order_id, status):
+        conn = self.connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT status FROM orders WHERE id = ?', (order_id,)).fetchone()
+            if row is None or row[0] == status:
+                conn.execute('ROLLBACK')
+                return False
+            conn.execute('UPDATE orders SET status = ? WHERE id = ?', (status, order_id))
+            self.count_status(conn, row[0], -1)
+            self.count_status(conn, status, 1)
+            conn.execute('COMMIT')
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return True
+
+    def get_dashboard(self, days=7, top=5):
+        # Reads the precomputed aggregate tables only; no order rows are scanned
+        conn = self.connect()
+        daily = conn.execute('SELECT day, revenue, orders FROM daily_revenue '
+                             'ORDER BY day DESC LIMIT ?', (days,)).fetchall()
+        total = conn.execute('SELECT COALESCE(SUM(revenue), 0), COALESCE(SUM(orders), 0) '
+                             'FROM daily_revenue').fetchone()
+        top_products = conn.execute('SELECT product, units, revenue FROM product_sales '
+                                    'ORDER BY units DESC LIMIT ?', (top,)).fetchall()
+        statuses = dict(conn.execute('SELECT status, orders FROM order_status_counts'))
+        conn.close()
+        return {
+            'daily': list(reversed(daily)),
+            'total_revenue': total[0],
+            'total_orders': total[1],
+            'top_products': top_products,
+            'pending': statuses.get('pending', 0),
+            'statuses': statuses
+        }
+
+    def get_order_items(self, order_id):
+        conn = self.connect()
+        rows = conn.execute('SELECT product, quantity, price FROM order_items WHERE order_id = ?',
+                            (order_id,)).fetchall()
+        conn.close()
+        return {product: {'quantity': q, 'price': p} for product, q, p in rows}
+
+    def place_order(self, customer, cart):
+        # One transaction: stock only drops where enough remains, and any short line
+        # rolls the whole order back, so concurrent checkouts can never oversell
+        order_id = str(uuid.uuid4())
+        date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        conn = self.connect()
+        try:
+            # IMMEDIATE takes the write lock up front instead of failing at the first UPDATE
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('INSERT INTO orders VALUES (?, ?, ?, ?)',
+                         (order_id, customer, date, 'pending'))
+            items = []
+            # Sorted so concurrent orders touch rows in the same order
+            for product in sorted(cart):
+                quantity = int(cart[product]['quantity'])
+                cursor = conn.execute('UPDATE products SET stock = stock - ? '
+                                      'WHERE name = ? AND stock >= ?',
+                                      (quantity, product, quantity))
+                if cursor.rowcount != 1:
+                    raise ValueError(f"Not enough stock for {product}")
+                price = conn.execute('SELECT price FROM products WHERE name = ?',
+                                     (product,)).fetchone()[0]
+                conn.execute('INSERT INTO order_items VALUES (?, ?, ?, ?)',
+                             (order_id, product, quantity, price))
+                items.append((product, quantity, price))
+            self.add_to_aggregates(conn, date, items)
+            conn.execute('COMMIT')
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return order_id
@@ -1,9 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import json
-import os
 from datetime import datetime
-import uuid
+from shop_store import ShopStore
+from shop_service import ShopService, Cart
+from product_catalog import ProductCatalog
+from virtual_treeview import VirtualTreeview
 
 class ShoppingPlatform:
     def __init__(self):
@@ -17,36 +18,18 @@ class ShoppingPlatform:
         
         # Current user info
         self.current_user = None
-        self.cart = {}
+        self.cart = Cart()
         
         self.create_gui()
         
     def load_data(self):
-        # Create data files if they don't exist
-        if not os.path.exists('users.json'):
-            self.users = {'admin': {'password': 'admin123', 'type': 'seller'}}
-            self.save_data('users.json', self.users)
-        else:
-            with open('users.json', 'r') as f:
-                self.users = json.load(f)
-                
-        if not os.path.exists('products.json'):
-            self.products = {}
-            self.save_data('products.json', self.products)
-        else:
-            with open('products.json', 'r') as f:
-                self.products = json.load(f)
-                
-        if not os.path.exists('orders.json'):
-            self.orders = {}
-            self.save_data('orders.json', self.orders)
-        else:
-            with open('orders.json', 'r') as f:
-                self.orders = json.load(f)
-                
-    def save_data(self, filename, data):
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
+        # Users, products and orders live in SQLite; old JSON files are imported once
+        self.store = ShopStore()
+        self.service = ShopService(self.store)
+        self.catalog = ProductCatalog(self.store.get_products())
+        self.products = self.catalog.products
+        self.orders = {}
+        self.last_order_rowid = 0
             
     def create_gui(self):
         # Login Frame
@@ -85,9 +68,32 @@ class ShoppingPlatform:
         tk.Label(product_frame, text="Available Products", 
                 font=("Helvetica", 16, "bold"), bg='#2E3B4E', fg='white').pack(pady=10)
         
-        self.product_list = ttk.Treeview(product_frame, columns=('Price', 'Stock'), show='headings')
-        self.product_list.heading('Price', text='Price')
-        self.product_list.heading('Stock', text='Stock')
+        # Search and filters
+        search_frame = tk.Frame(product_frame, bg='#2E3B4E')
+        search_frame.pack(fill=tk.X, pady=5)
+        
+        tk.Label(search_frame, text="Search:", bg='#2E3B4E', fg='white').pack(side=tk.LEFT)
+        self.search_entry = ttk.Entry(search_frame)
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        tk.Label(search_frame, text="Min $:", bg='#2E3B4E', fg='white').pack(side=tk.LEFT)
+        self.min_price_entry = ttk.Entry(search_frame, width=8)
+        self.min_price_entry.pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(search_frame, text="Max $:", bg='#2E3B4E', fg='white').pack(side=tk.LEFT)
+        self.max_price_entry = ttk.Entry(search_frame, width=8)
+        self.max_price_entry.pack(side=tk.LEFT, padx=5)
+        
+        self.in_stock_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="In stock", variable=self.in_stock_var,
+                       command=self.apply_filters).pack(side=tk.LEFT, padx=5)
+        
+        for entry in (self.search_entry, self.min_price_entry, self.max_price_entry):
+            entry.bind('<KeyRelease>', lambda e: self.apply_filters())
+        
+        # Only the visible rows exist as Treeview items, however large the catalog
+        self.product_list = VirtualTreeview(product_frame, ('Product', 'Price', 'Stock'),
+                                            self.product_row)
         self.product_list.pack(fill=tk.BOTH, expand=True)
         
         # Cart Frame
@@ -138,24 +144,49 @@ class ShoppingPlatform:
                                  bg='#2E3B4E', fg='white')
         order_mgmt.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        self.order_list = ttk.Treeview(order_mgmt, 
-                                     columns=('Customer', 'Date', 'Status'), 
-                                     show='headings')
-        self.order_list.heading('Customer', text='Customer')
-        self.order_list.heading('Date', text='Date')
-        self.order_list.heading('Status', text='Status')
+        self.order_list = VirtualTreeview(order_mgmt, ('Customer', 'Date', 'Status'),
+                                          self.order_row)
         self.order_list.pack(fill=tk.BOTH, expand=True)
         
+        order_buttons = tk.Frame(order_mgmt, bg='#2E3B4E')
+        order_buttons.pack(pady=5)
+        ttk.Button(order_buttons, text="Mark Shipped", 
+                  command=lambda: self.set_order_status('shipped')).pack(side=tk.LEFT, padx=5)
+        ttk.Button(order_buttons, text="Refresh", 
+                  command=self.refresh_order_list).pack(side=tk.LEFT, padx=5)
+        
+        # Seller Dashboard
+        dashboard = tk.LabelFrame(self.seller_frame, text="Dashboard", 
+                                bg='#2E3B4E', fg='white')
+        dashboard.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        self.dashboard_summary = tk.Label(dashboard, bg='#2E3B4E', fg='white', 
+                                        justify=tk.LEFT, font=("Helvetica", 12))
+        self.dashboard_summary.pack(anchor=tk.W, padx=5, pady=5)
+        
+        self.daily_list = ttk.Treeview(dashboard, columns=('Day', 'Orders', 'Revenue'), 
+                                     show='headings', height=7)
+        for column in ('Day', 'Orders', 'Revenue'):
+            self.daily_list.heading(column, text=column)
+        self.daily_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+        
+        self.top_list = ttk.Treeview(dashboard, columns=('Product', 'Units', 'Revenue'), 
+                                   show='headings', height=7)
+        for column in ('Product', 'Units', 'Revenue'):
+            self.top_list.heading(column, text=column)
+        self.top_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+        
     def login(self):
         username = self.username_entry.get()
         password = self.password_entry.get()
         
-        if username in self.users and self.users[username]['password'] == password:
+        user = self.service.authenticate(username, password)
+        if user:
             self.current_user = username
             self.login_frame.pack_forget()
             self.main_frame.pack(expand=True, fill=tk.BOTH)
             
-            if self.users[username]['type'] == 'seller':
+            if user['type'] == 'seller':
                 self.seller_frame.pack(expand=True, fill=tk.BOTH)
                 self.refresh_order_list()
             else:
@@ -183,25 +214,39 @@ class ShoppingPlatform:
         user_type.pack()
         
         def register():
-            if username.get() in self.users:
+            if not self.service.register(username.get(), password.get(), user_type.get()):
                 messagebox.showerror("Error", "Username already exists!")
                 return
                 
-            self.users[username.get()] = {
-                'password': password.get(),
-                'type': user_type.get()
-            }
-            self.save_data('users.json', self.users)
             messagebox.showinfo("Success", "Registration successful!")
             register_window.destroy()
             
         ttk.Button(register_window, text="Register", command=register).pack(pady=10)
         
+    def product_row(self, name):
+        details = self.products[name]
+        return name, (name, f"${details['price']}", details['stock'])
+        
+    def parse_price(self, entry):
+        try:
+            return float(entry.get())
+        except ValueError:
+            return None
+            
+    def apply_filters(self, changed=()):
+        names = self.catalog.search(self.search_entry.get(),
+                                    self.parse_price(self.min_price_entry),
+                                    self.parse_price(self.max_price_entry),
+                                    self.in_stock_var.get())
+        if names == self.product_list.keys:
+            self.product_list.refresh(changed)
+        else:
+            self.product_list.set_keys(names)
+            
     def refresh_product_list(self):
-        self.product_list.delete(*self.product_list.get_children())
-        for name, details in self.products.items():
-            self.product_list.insert('', 'end', text=name, 
-                                   values=(f"${details['price']}", details['stock']))
+        # Diff against the catalog so only rows whose product changed are redrawn
+        changed = self.catalog.sync(self.store.get_products())
+        self.apply_filters(changed)
             
     def add_to_cart(self):
         selection = self.product_list.selection()
@@ -209,13 +254,12 @@ class ShoppingPlatform:
             return
             
         product = self.product_list.item(selection[0])
-        if product['text'] in self.cart:
-            self.cart[product['text']]['quantity'] += 1
-        else:
-            self.cart[product['text']] = {
-                'quantity': 1,
-                'price': float(self.products[product['text']]['price'])
-            }
+        try:
+            self.service.add_to_cart(self.cart, product['text'])
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            self.refresh_product_list()
+            return
             
         self.refresh_cart()
         
@@ -225,12 +269,12 @@ class ShoppingPlatform:
             return
             
         product = self.cart_list.item(selection[0])
-        del self.cart[product['text']]
+        self.cart.remove(product['text'])
         self.refresh_cart()
         
     def refresh_cart(self):
         self.cart_list.delete(*self.cart_list.get_children())
-        for name, details in self.cart.items():
+        for name, details in self.cart.items.items():
             self.cart_list.insert('', 'end', text=name,
                                 values=(details['quantity'],
                                        f"${details['price'] * details['quantity']}"))
@@ -240,22 +284,13 @@ class ShoppingPlatform:
             messagebox.showinfo("Info", "Cart is empty!")
             return
             
-        order_id = str(uuid.uuid4())
-        self.orders[order_id] = {
-            'customer': self.current_user,
-            'items': self.cart,
-            'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'status': 'pending'
-        }
-        
-        # Update stock
-        for product, details in self.cart.items():
-            self.products[product]['stock'] -= details['quantity']
-            
-        self.save_data('orders.json', self.orders)
-        self.save_data('products.json', self.products)
+        try:
+            self.service.checkout(self.current_user, self.cart)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            self.refresh_product_list()
+            return
         
-        self.cart = {}
         self.refresh_cart()
         self.refresh_product_list()
         messagebox.showinfo("Success", "Order placed successfully!")
@@ -272,25 +307,59 @@ class ShoppingPlatform:
         try:
             price = float(price)
             stock = int(stock)
+            if price < 0 or stock < 0:
+                raise ValueError
         except ValueError:
             messagebox.showerror("Error", "Invalid price or stock value!")
             return
             
-        self.products[name] = {'price': price, 'stock': stock}
-        self.save_data('products.json', self.products)
+        self.store.upsert_product(name, price, stock)
         messagebox.showinfo("Success", "Product added/updated successfully!")
         
         self.product_name.delete(0, tk.END)
         self.product_price.delete(0, tk.END)
         self.product_stock.delete(0, tk.END)
         
+    def order_row(self, order_id):
+        details = self.orders[order_id]
+        return order_id, (details['customer'], details['date'], details['status'])
+        
     def refresh_order_list(self):
-        self.order_list.delete(*self.order_list.get_children())
-        for order_id, details in self.orders.items():
-            self.order_list.insert('', 'end', text=order_id,
-                                 values=(details['customer'],
-                                        details['date'],
-                                        details['status']))
+        # Only orders written since the last refresh are fetched and appended
+        new_orders, self.last_order_rowid = self.store.get_orders_since(self.last_order_rowid)
+        if new_orders:
+            self.orders.update(new_orders)
+            self.order_list.set_keys(self.order_list.keys + list(new_orders))
+        self.refresh_dashboard()
+        
+    def set_order_status(self, status):
+        selection = self.order_list.selection()
+        if not selection:
+            return
+            
+        order_id = self.order_list.item(selection[0])['text']
+        if self.store.set_order_status(order_id, status):
+            self.orders[order_id]['status'] = status
+            self.order_list.refresh({order_id})
+            self.refresh_dashboard()
+            
+    def refresh_dashboard(self):
+        # Every figure comes from the aggregates maintained at checkout time
+        stats = self.store.get_dashboard()
+        today = stats['daily'][-1] if stats['daily'] else None
+        today_revenue = today[1] if today and today[0] == datetime.now().strftime("%Y-%m-%d") else 0
+        self.dashboard_summary.config(
+            text=f"Total revenue: ${stats['total_revenue']:.2f} from {stats['total_orders']} orders\n"
+                 f"Today's revenue: ${today_revenue:.2f}\n"
+                 f"Pending orders: {stats['pending']}")
+        
+        self.daily_list.delete(*self.daily_list.get_children())
+        for day, revenue, orders in stats['daily']:
+            self.daily_list.insert('', 'end', values=(day, orders, f"${revenue:.2f}"))
+            
+        self.top_list.delete(*self.top_list.get_children())
+        for product, units, revenue in stats['top_products']:
+            self.top_list.insert('', 'end', values=(product, units, f"${revenue:.2f}"))
             
     def run(self):
         self.window.mainloop()
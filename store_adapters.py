@@ -0,0 +1,97 @@
+import re
+import time
+from urllib.parse import quote
+
+from bs4 import BeautifulSoup
+
+import http_fetch
+
+PRICE_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+STORE_REGISTRY = {}
+
+
+def register_store(cls):
+    STORE_REGISTRY[cls.name] = cls()
+    return cls
+
+
+def get_stores(names=None):
+    if not names:
+        return list(STORE_REGISTRY.values())
+    return [STORE_REGISTRY[name] for name in names]
+
+
+def price_value(text):
+    match = PRICE_RE.search(text or '')
+    return float(match.group().replace(',', '')) if match else None
+
+
+class StoreAdapter:
+    # Subclasses set these; override parse_price for stores that need more than one tag lookup
+    name = ''
+    label = ''
+    search_url = ''
+    price_tag = None
+    price_class = None
+    currency = ''
+
+    def url_for(self, query):
+        return self.search_url.format(quote(query))
+
+    def parse_price(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        price = soup.find(self.price_tag, class_=self.price_class)
+        return price.text.strip() if price else None
+
+    def fetch(self, query, headers=None, timeout=8, fetcher=None):
+        start = time.perf_counter()
+        result = {'store': self.name, 'query': query, 'price': None, 'text': None, 'error': None}
+        client = fetcher or http_fetch
+        try:
+            response = client.get(self.url_for(query), headers=headers,
+                                  timeout=(min(3, timeout), timeout))
+            response.raise_for_status()
+            text = self.parse_price(response.text)
+            if text:
+                result['text'] = f"{self.currency}{text}"
+                result['price'] = price_value(text)
+            else:
+                result['error'] = 'Price not found'
+        except Exception as e:
+            result['error'] = str(e)
+        result['latency'] = time.perf_counter() - start
+        return result
+
+    def format_result(self, result):
+        if result['text']:
+            return f"{self.label}: {result['text']}"
+        return f"{self.label}: Price not found"
+
+
+@register_store
+class AmazonAdapter(StoreAdapter):
+    name = 'amazon'
+    label = 'Amazon'
+    search_url = 'https://www.amazon.in/s?k={}'
+    price_tag = 'span'
+    price_class = 'a-price-whole'
+    currency = '₹'
+
+
+@register_store
+class FlipkartAdapter(StoreAdapter):
+    name = 'flipkart'
+    label = 'Flipkart'
+    search_url = 'https://www.flipkart.com/search?q={}'
+    price_tag = 'div'
+    price_class = '_30jeq3'
+
+
+@register_store
+class BigBasketAdapter(StoreAdapter):
+    name = 'bigbasket'
+    label = 'BigBasket'
+    search_url = 'https://www.bigbasket.com/ps/?q={}'
+    price_tag = 'span'
+    price_class = 'Price'
@@ -0,0 +1,163 @@
+import csv
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+RECORD_FIELDS = ['source', 'index', 'value']
+
+
+def to_cell(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return json.dumps(value, default=str)
+
+
+def iter_records(data):
+    # Flatten scraped data into (source, index, value) rows one item at a time
+    for key, value in data.items():
+        if isinstance(value, pd.DataFrame):
+            value = [value]
+        if isinstance(value, str):
+            yield {'source': key, 'index': 0, 'value': value}
+        elif isinstance(value, dict):
+            for name, item in value.items():
+                for record in iter_records({f"{key}.{name}": item}):
+                    yield record
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                if isinstance(item, pd.DataFrame):
+                    for row_number, row in enumerate(item.itertuples(index=False)):
+                        yield {'source': f"{key}[{i}]", 'index': row_number,
+                               'value': json.dumps(dict(zip(map(str, item.columns), row)),
+                                                   default=str)}
+                else:
+                    yield {'source': key, 'index': i, 'value': to_cell(item)}
+        elif value is not None:
+            yield {'source': key, 'index': 0, 'value': to_cell(value)}
+
+
+class CSVStreamWriter:
+    def __init__(self, path, fieldnames=RECORD_FIELDS):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=fieldnames, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record)
+
+    def close(self):
+        self.file.close()
+
+
+class JSONLStreamWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        self.file.write(json.dumps(record, default=str) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetStreamWriter:
+    def __init__(self, path, fieldnames=RECORD_FIELDS, batch_size=10000):
+        if pa is None:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.path = path
+        self.fieldnames = fieldnames
+        self.batch_size = batch_size
+        self.batch = []
+        self.writer = None
+
+    def write(self, record):
+        self.batch.append(record)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.batch:
+            return
+        columns = {name: [None if r.get(name) is None else str(r.get(name)) for r in self.batch]
+                   for name in self.fieldnames}
+        table = pa.table(columns, schema=pa.schema([(name, pa.string()) for name in self.fieldnames]))
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.batch = []
+
+    def close(self):
+        self.flush()
+        if self.writer is None:
+            pq.write_table(pa.table({name: pa.array([], pa.string()) for name in self.fieldnames}),
+                           self.path)
+        else:
+            self.writer.close()
+
+
+class ExcelStreamWriter:
+    def __init__(self, path, fieldnames=RECORD_FIELDS):
+        if Workbook is None:
+            raise ImportError("Excel export requires openpyxl (pip install openpyxl)")
+        self.path = path
+        self.fieldnames = fieldnames
+        # Write-only workbooks flush rows to disk instead of keeping cell objects
+        self.workbook = Workbook(write_only=True)
+        self.sheets = {}
+
+    def sheet_for(self, source):
+        name = source.split('[')[0][:31] or 'data'
+        if name not in self.sheets:
+            sheet = self.workbook.create_sheet(title=name)
+            sheet.append(self.fieldnames)
+            self.sheets[name] = sheet
+        return self.sheets[name]
+
+    def write(self, record):
+        self.sheet_for(str(record.get('source', ''))).append(
+            [record.get(name) for name in self.fieldnames])
+
+    def close(self):
+        if not self.sheets:
+            self.workbook.create_sheet(title='data').append(self.fieldnames)
+        self.workbook.save(self.path)
+
+
+WRITERS = {
+    'csv': CSVStreamWriter,
+    'jsonl': JSONLStreamWriter,
+    'parquet': ParquetStreamWriter,
+    'xlsx': ExcelStreamWriter
+}
+
+
+def open_writer(path, format_type):
+    if format_type not in WRITERS:
+        raise ValueError(f"Unsupported export format: {format_type}")
+    return WRITERS[format_type](path)
+
+
+def export_records(records, path, format_type):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    writer = open_writer(path, format_type)
+    count = 0
+    try:
+        for record in records:
+            writer.write(record)
+            count += 1
+    finally:
+        writer.close()
+    return count
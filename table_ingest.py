@@ -0,0 +1,122 @@
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import pandas as pd
+
+import http_fetch
+from dom_extractor import make_soup, extract_single_pass, dedupe_columns
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+NEXT_TEXT_RE = re.compile(r'^\s*(next|more|older|›|»|>|>>)\s*$', re.IGNORECASE)
+
+
+def page_urls(template, first=1, last=1):
+    return [template.format(page=page) for page in range(first, last + 1)]
+
+
+def find_next_link(soup, url):
+    link = soup.find(['a', 'link'], rel='next', href=True)
+    if link is None:
+        link = soup.find('a', href=True, string=NEXT_TEXT_RE)
+    return urljoin(url, link['href']) if link else None
+
+
+def fetch_tables(url, headers=None):
+    response = http_fetch.get(url, headers=headers)
+    response.raise_for_status()
+    soup = make_soup(response.text)
+    return soup, extract_single_pass(soup, tables=True)['tables']
+
+
+def schema_key(df):
+    return tuple(re.sub(r'\s+', ' ', str(c)).strip().lower() for c in df.columns)
+
+
+def compatible(base, df):
+    # Same column names (ignoring case and spacing) and no numeric/text flips
+    if schema_key(base) != schema_key(df):
+        return False
+    for left, right in zip(base.dtypes, df.dtypes):
+        if pd.api.types.is_numeric_dtype(left) != pd.api.types.is_numeric_dtype(right):
+            if not (df.empty or base.empty):
+                return False
+    return True
+
+
+def combine_tables(tables):
+    groups = {}
+    for df in tables:
+        groups.setdefault(schema_key(df), []).append(df)
+    if not groups:
+        return None, {'tables': 0, 'merged': 0, 'skipped': 0}
+
+    # The schema with the most rows is the dataset; other shapes are reported
+    best = max(groups.values(), key=lambda dfs: sum(len(df) for df in dfs))
+    base = best[0]
+    merged = [df for df in best if compatible(base, df)]
+    for df in merged:
+        df.columns = base.columns
+    combined = pd.concat(merged, ignore_index=True)
+    # Label-based column access needs unique names, whatever the source table had
+    combined.columns = dedupe_columns([str(c) for c in combined.columns])
+    stats = {'tables': len(tables), 'merged': len(merged), 'skipped': len(tables) - len(merged)}
+    return combined, stats
+
+
+def ingest(start_url=None, template=None, first=1, last=1, follow_next=False,
+           max_pages=20, workers=6, headers=None):
+    tables = []
+    pages = 0
+    if template:
+        urls = page_urls(template, first, last)[:max_pages]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _, page_tables in executor.map(lambda u: fetch_tables(u, headers), urls):
+                tables.extend(page_tables)
+                pages += 1
+    else:
+        # "Next" links are only known after each page arrives, so discovery is sequential
+        url = start_url
+        seen = set()
+        while url and url not in seen and pages < max_pages:
+            seen.add(url)
+            soup, page_tables = fetch_tables(url, headers)
+            tables.extend(page_tables)
+            pages += 1
+            url = find_next_link(soup, url) if follow_next else None
+
+    combined, stats = combine_tables(tables)
+    stats['pages'] = pages
+    return combined, stats
+
+
+def cache_path(source, cache_dir='table_cache'):
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, hashlib.sha1(source.encode('utf-8')).hexdigest() + '.parquet')
+
+
+def save_parquet(df, path):
+    if pq is None:
+        return None
+    # Parquet needs string column names and uniform object columns
+    df = df.copy()
+    df.columns = dedupe_columns([str(c) for c in df.columns])
+    for position, (_, series) in enumerate(df.items()):
+        if series.dtype == object:
+            df.iloc[:, position] = series.where(series.isna(), series.astype(str))
+    df.to_parquet(path, index=False)
+    return path
+
+
+def parquet_columns(path):
+    return pq.read_schema(path).names
+
+
+def load_columns(path, columns):
+    return pd.read_parquet(path, columns=list(columns))
@@ -0,0 +1,19 @@
+from entity_extractor import extract_entities, iter_text
+
+
+def test_phone_does_not_span_list_items():
+    assert extract_entities(iter_text(['Call 123', '456 now']), ('phone',))['phone'] == []
+    result = extract_entities(iter_text(['Call 12345', '67890 now']), ('phone',))
+    assert result['phone'] == ['12345', '67890']
+
+
+def test_phone_does_not_span_dict_values():
+    result = extract_entities(iter_text({'a': 'tel 55512', 'b': '34567 x'}), ('phone',))
+    assert result['phone'] == ['55512', '34567']
+
+
+def test_entities_inside_one_item_still_match():
+    data = ['Mail jane.doe@example.com or call +1 415-555-0100', 'nothing here']
+    result = extract_entities(iter_text(data))
+    assert result['email'] == ['jane.doe@example.com']
+    assert result['phone'] == ['+1 415-555-0100']
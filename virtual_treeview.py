@@ -0,0 +1,134 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+# Treeview that only materialises the rows on screen: a fixed pool of row items is
+# rewritten as the view scrolls, so 50,000 keys cost the same as one screenful.
+# row_values(key) returns the (text, values) shown for a key.
+class VirtualTreeview(ttk.Frame):
+    def __init__(self, master, columns, row_values, rows=20, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_values = row_values
+        self.keys = []
+        self.first = 0
+        self.slots = []
+        self.selected_key = None
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=rows)
+        for column in columns:
+            self.tree.heading(column, text=column)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', self.on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_to(self.first - 3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_to(self.first + 3))
+        self.tree.bind('<Up>', lambda e: self.step(-1))
+        self.tree.bind('<Down>', lambda e: self.step(1))
+        self.resize(rows)
+
+    def resize(self, rows):
+        rows = max(rows, 1)
+        while len(self.slots) < rows:
+            self.slots.append(self.tree.insert('', 'end', text=''))
+        while len(self.slots) > rows:
+            self.tree.delete(self.slots.pop())
+        self.render()
+
+    def on_resize(self, event):
+        style = ttk.Style()
+        row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+        header = 25
+        self.resize((event.height - header) // row_height)
+
+    def on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self.slots:
+            index = self.first + self.slots.index(selection[0])
+            if index < len(self.keys):
+                self.selected_key = self.keys[index]
+
+    def on_wheel(self, event):
+        self.scroll_to(self.first - int(event.delta / 120) * 3)
+        return 'break'
+
+    def step(self, delta):
+        # Keyboard navigation scrolls the window once the selection hits an edge
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        index = self.slots.index(selection[0]) + delta
+        if 0 <= index < self.visible_count():
+            return None
+        self.scroll_to(self.first + delta)
+        return 'break'
+
+    def visible_count(self):
+        return max(0, min(len(self.slots), len(self.keys) - self.first))
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * len(self.keys)))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= len(self.slots)
+            self.scroll_to(self.first + amount)
+
+    def scroll_to(self, first):
+        last_start = max(0, len(self.keys) - len(self.slots))
+        first = max(0, min(first, last_start))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def set_keys(self, keys):
+        # New ordering/filter: keep the scroll position where possible
+        self.keys = list(keys)
+        self.scroll_to(self.first)
+        self.render()
+
+    def refresh(self, changed):
+        # Rewrite only the on-screen rows whose key changed
+        for slot, key in zip(self.slots, self.keys[self.first:]):
+            if key in changed:
+                self.fill(slot, key)
+
+    def fill(self, slot, key):
+        text, values = self.row_values(key)
+        self.tree.item(slot, text=text, values=values)
+
+    def render(self):
+        visible = self.visible_count()
+        attached = set(self.tree.get_children())
+        selected = None
+        for index, slot in enumerate(self.slots):
+            if index < visible:
+                key = self.keys[self.first + index]
+                self.fill(slot, key)
+                if slot not in attached:
+                    self.tree.move(slot, '', index)
+                if key == self.selected_key:
+                    selected = slot
+            elif slot in attached:
+                self.tree.detach(slot)
+        # The selection follows its key, not the recycled row item
+        if selected:
+            self.tree.selection_set(selected)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        total = len(self.keys)
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + len(self.slots)) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def selection(self):
+        return self.tree.selection()
+
+    def item(self, iid):
+        return self.tree.item(iid)
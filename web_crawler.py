@@ -0,0 +1,136 @@
+import asyncio
+import json
+import re
+import time
+from collections import defaultdict
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+
+import pandas as pd
+
+import http_fetch
+from dom_extractor import make_soup
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    parts = urlparse(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r'/{2,}', '/', parts.path) or '/'
+    if path != '/' and path.endswith('/'):
+        path = path[:-1]
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunparse((scheme, host, path, '', query, ''))
+
+
+def json_default(value):
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict('records')
+    return str(value)
+
+
+class Crawler:
+    def __init__(self, seed_url, extract, output_path, include=None, exclude=None,
+                 max_depth=2, max_pages=100, concurrency=8, delay=1.0,
+                 same_domain=True, headers=None, fetcher=None, parser=None):
+        self.seed_url = normalize_url(seed_url)
+        self.extract = extract
+        self.output_path = output_path
+        self.include = [re.compile(p) for p in include or []]
+        self.exclude = [re.compile(p) for p in exclude or []]
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.delay = delay
+        self.same_domain = same_domain
+        self.headers = headers
+        self.parser = parser
+        self.fetcher = fetcher or http_fetch.get_fetcher()
+        self.seed_domain = urlparse(self.seed_url).netloc
+
+        self.seen = set()
+        self.stats = {'pages': 0, 'failed': 0, 'queued': 0}
+
+    def allowed(self, url):
+        parts = urlparse(url)
+        if parts.scheme not in ('http', 'https'):
+            return False
+        if self.same_domain and parts.netloc != self.seed_domain:
+            return False
+        if self.include and not any(p.search(url) for p in self.include):
+            return False
+        if any(p.search(url) for p in self.exclude):
+            return False
+        return True
+
+    def enqueue(self, queue, url, depth):
+        url = normalize_url(url)
+        if url in self.seen or len(self.seen) >= self.max_pages:
+            return
+        if url != self.seed_url and not self.allowed(url):
+            return
+        self.seen.add(url)
+        self.stats['queued'] += 1
+        queue.put_nowait((url, depth))
+
+    async def polite_wait(self, domain):
+        # Space out request starts to the same domain by at least `delay` seconds
+        async with self.domain_locks[domain]:
+            wait = self.next_slot[domain] - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.next_slot[domain] = time.monotonic() + self.delay
+
+    def parse_page(self, url, html, depth):
+        soup = make_soup(html, self.parser)
+        links = []
+        if depth < self.max_depth:
+            links = [urljoin(url, a['href']) for a in soup.find_all('a', href=True)]
+        return self.extract(soup), links
+
+    async def worker(self, queue, output):
+        while True:
+            url, depth = await queue.get()
+            try:
+                await self.polite_wait(urlparse(url).netloc)
+                response = await self.fetcher.get_async(url, headers=self.headers)
+                response.raise_for_status()
+                data, links = await asyncio.to_thread(self.parse_page, url, response.text, depth)
+
+                output.write(json.dumps({'url': url, 'depth': depth, 'data': data},
+                                        default=json_default) + '\n')
+                output.flush()
+                self.stats['pages'] += 1
+
+                for link in links:
+                    self.enqueue(queue, link, depth + 1)
+            except Exception as e:
+                self.stats['failed'] += 1
+                output.write(json.dumps({'url': url, 'depth': depth, 'error': str(e)}) + '\n')
+                output.flush()
+            finally:
+                queue.task_done()
+
+    async def crawl_async(self):
+        self.domain_locks = defaultdict(asyncio.Lock)
+        self.next_slot = defaultdict(float)
+        queue = asyncio.Queue()
+        self.enqueue(queue, self.seed_url, 0)
+
+        start = time.perf_counter()
+        with open(self.output_path, 'w', encoding='utf-8') as output:
+            workers = [asyncio.create_task(self.worker(queue, output))
+                       for _ in range(self.concurrency)]
+            await queue.join()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        self.stats['seconds'] = time.perf_counter() - start
+        return self.stats
+
+    def crawl(self):
+        return asyncio.run(self.crawl_async())
@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-import requests
-from bs4 import BeautifulSoup
+import http_fetch
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -10,6 +9,20 @@ import numpy as np
 from datetime import datetime
 import re
 import json
+import threading
+from review_sentiment import ReviewScorer, iter_reviews_file, load_model
+from dom_extractor import make_soup, build_class_index, select_by_class
+
+# Class-name patterns for each scraping option, compiled once
+CLASS_PATTERNS = {
+    'Reviews': re.compile('review|comment'),
+    'Ratings': re.compile('rating|stars'),
+    'Prices': re.compile('price'),
+    'Visits': re.compile('views|visits'),
+    'Sales': re.compile('sales|sold')
+}
+DECIMAL_RE = re.compile(r'\d+\.?\d*')
+INTEGER_RE = re.compile(r'\d+')
 
 class WebDataAnalyzer:
     def __init__(self):
@@ -20,6 +33,8 @@ class WebDataAnalyzer:
         
         self.df = None
         self.scraped_data = {}
+        self.sentiment_model = None
+        self.scoring = False
         self.create_gui()
         
     def create_gui(self):
@@ -67,6 +82,7 @@ class WebDataAnalyzer:
         
         analysis_buttons = [
             ("Review Analysis", self.analyze_reviews),
+            ("Score Reviews File", self.analyze_reviews_file),
             ("Rating Distribution", self.analyze_ratings),
             ("Price Trends", self.analyze_prices),
             ("Visit Statistics", self.analyze_visits),
@@ -78,6 +94,10 @@ class WebDataAnalyzer:
             ttk.Button(analysis_frame, text=text, 
                       command=command).pack(fill='x', pady=2)
         
+        self.use_model = tk.BooleanVar(value=False)
+        ttk.Checkbutton(analysis_frame, text="Use sentiment model (if installed)",
+                       variable=self.use_model).pack(anchor='w', pady=2)
+        
         # Graph area
         self.graph_frame = ttk.LabelFrame(right_panel, text="Visualization")
         self.graph_frame.pack(fill='both', expand=True, pady=5)
@@ -90,31 +110,32 @@ class WebDataAnalyzer:
         
         try:
             headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(url, headers=headers)
+            response = http_fetch.get(url, headers=headers)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
+            
+            # Walk the tree once, then answer every selection from the class index
+            index = build_class_index(soup)
+            selected = {option: select_by_class(index, pattern)
+                        for option, pattern in CLASS_PATTERNS.items()
+                        if self.scrape_vars[option].get()}
             
             self.scraped_data = {}
             
-            if self.scrape_vars['Reviews'].get():
-                reviews = soup.find_all(class_=re.compile('review|comment'))
-                self.scraped_data['reviews'] = [r.text.strip() for r in reviews]
+            if 'Reviews' in selected:
+                self.scraped_data['reviews'] = [r.text.strip() for r in selected['Reviews']]
             
-            if self.scrape_vars['Ratings'].get():
-                ratings = soup.find_all(class_=re.compile('rating|stars'))
-                self.scraped_data['ratings'] = [self.extract_rating(r.text) for r in ratings]
+            if 'Ratings' in selected:
+                self.scraped_data['ratings'] = [self.extract_rating(r.text) for r in selected['Ratings']]
             
-            if self.scrape_vars['Prices'].get():
-                prices = soup.find_all(class_=re.compile('price'))
-                self.scraped_data['prices'] = [self.extract_price(p.text) for p in prices]
+            if 'Prices' in selected:
+                self.scraped_data['prices'] = [self.extract_price(p.text) for p in selected['Prices']]
             
-            if self.scrape_vars['Visits'].get():
-                visits = soup.find_all(class_=re.compile('views|visits'))
-                self.scraped_data['visits'] = [self.extract_number(v.text) for v in visits]
+            if 'Visits' in selected:
+                self.scraped_data['visits'] = [self.extract_number(v.text) for v in selected['Visits']]
             
-            if self.scrape_vars['Sales'].get():
-                sales = soup.find_all(class_=re.compile('sales|sold'))
-                self.scraped_data['sales'] = [self.extract_number(s.text) for s in sales]
+            if 'Sales' in selected:
+                self.scraped_data['sales'] = [self.extract_number(s.text) for s in selected['Sales']]
             
             self.display_scraped_data()
             messagebox.showinfo("Success", "Data scraped successfully!")
@@ -123,22 +144,16 @@ class WebDataAnalyzer:
             messagebox.showerror("Error", f"Failed to scrape data: {str(e)}")
     
     def extract_rating(self, text):
-        try:
-            return float(re.search(r'\d+\.?\d*', text).group())
-        except:
-            return 0
+        match = DECIMAL_RE.search(text)
+        return float(match.group()) if match else 0
     
     def extract_price(self, text):
-        try:
-            return float(re.search(r'\d+\.?\d*', text).group())
-        except:
-            return 0
+        match = DECIMAL_RE.search(text)
+        return float(match.group()) if match else 0
     
     def extract_number(self, text):
-        try:
-            return int(re.search(r'\d+', text).group())
-        except:
-            return 0
+        match = INTEGER_RE.search(text)
+        return int(match.group()) if match else 0
     
     def display_scraped_data(self):
         self.data_display.delete(1.0, tk.END)
@@ -151,22 +166,49 @@ class WebDataAnalyzer:
             messagebox.showwarning("Warning", "No review data available!")
             return
         
-        # Simple sentiment analysis
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'perfect']
-        negative_words = ['bad', 'poor', 'terrible', 'awful', 'horrible']
-        
-        sentiments = []
-        for review in self.scraped_data['reviews']:
-            review = review.lower()
-            pos_count = sum(1 for word in positive_words if word in review)
-            neg_count = sum(1 for word in negative_words if word in review)
-            sentiments.append('Positive' if pos_count > neg_count else 'Negative')
+        self.start_review_scoring(self.scraped_data['reviews'])
+    
+    def analyze_reviews_file(self):
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Review files", "*.txt *.jsonl"), ("All files", "*.*")])
+        if file_path:
+            self.start_review_scoring(iter_reviews_file(file_path))
+    
+    def start_review_scoring(self, reviews):
+        if self.scoring:
+            messagebox.showinfo("Info", "Review scoring is already running!")
+            return
         
-        sentiment_counts = pd.Series(sentiments).value_counts()
+        model = None
+        if self.use_model.get():
+            if self.sentiment_model is None:
+                self.sentiment_model = load_model()
+            model = self.sentiment_model
+            if model is None:
+                messagebox.showwarning("Warning", "transformers is not installed, using the word lexicon.")
         
+        self.scoring = True
+        scorer = ReviewScorer(model=model)
+        threading.Thread(target=self.score_reviews, args=(scorer, reviews), daemon=True).start()
+    
+    def score_reviews(self, scorer, reviews):
+        # Chunks are scored in the background; the chart refreshes after each one
+        try:
+            scorer.score(reviews, 'review_scores.csv',
+                         on_chunk=lambda agg: self.window.after(
+                             0, self.plot_sentiment, dict(agg.counts), agg.total, agg.mean_score))
+        except Exception as e:
+            self.window.after(0, messagebox.showerror, "Error", f"Review scoring failed: {str(e)}")
+        finally:
+            self.scoring = False
+    
+    def plot_sentiment(self, counts, total, mean_score):
+        plt.close('all')
         plt.figure(figsize=(8, 6))
+        sentiment_counts = pd.Series({k: v for k, v in counts.items() if v})
         sentiment_counts.plot(kind='pie', autopct='%1.1f%%')
-        plt.title('Review Sentiment Distribution')
+        plt.title(f'Review Sentiment Distribution ({total} reviews, mean score {mean_score:.2f})')
+        plt.ylabel('')
         self.display_plot()
     
     def analyze_ratings(self):
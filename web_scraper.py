@@ -1,9 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-import requests
+import http_fetch
+from entity_extractor import (clean_text, collapse_whitespace, extract_entities,
+                              iter_text)
+from stream_export import CSVStreamWriter
 from bs4 import BeautifulSoup
 import pandas as pd
-import re
 import json
 from urllib.parse import urlparse
 import os
@@ -94,7 +96,7 @@ class WebScraper:
             
         try:
             headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(url, headers=headers)
+            response = http_fetch.get(url, headers=headers)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             
@@ -139,12 +141,10 @@ class WebScraper:
             
         if isinstance(self.scraped_data, str):
             # Remove extra whitespace and special characters
-            cleaned = re.sub(r'\s+', ' ', self.scraped_data)
-            cleaned = re.sub(r'[^\w\s@.-]', '', cleaned)
-            self.scraped_data = cleaned.strip()
+            self.scraped_data = clean_text(self.scraped_data)
         elif isinstance(self.scraped_data, list):
             # Clean each item in the list
-            self.scraped_data = [re.sub(r'\s+', ' ', str(item)).strip() 
+            self.scraped_data = [collapse_whitespace(str(item))
                                for item in self.scraped_data]
             
         self.display_data()
@@ -154,9 +154,7 @@ class WebScraper:
             messagebox.showwarning("Warning", "No data to process!")
             return
             
-        text = str(self.scraped_data)
-        emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', text)
-        self.scraped_data = emails
+        self.scraped_data = extract_entities(iter_text(self.scraped_data), ('email',))['email']
         self.display_data()
         
     def extract_phone_numbers(self):
@@ -164,9 +162,7 @@ class WebScraper:
             messagebox.showwarning("Warning", "No data to process!")
             return
             
-        text = str(self.scraped_data)
-        phones = re.findall(r'\+?\d{1,4}?[-.\s]?\(?\d{1,3}?\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}', text)
-        self.scraped_data = phones
+        self.scraped_data = extract_entities(iter_text(self.scraped_data), ('phone',))['phone']
         self.display_data()
         
     def count_words(self):
@@ -205,11 +201,14 @@ class WebScraper:
         if file_path:
             try:
                 if format_type == 'csv':
-                    if isinstance(self.scraped_data, list):
-                        df = pd.DataFrame(self.scraped_data, columns=['Data'])
-                    else:
-                        df = pd.DataFrame([self.scraped_data], columns=['Data'])
-                    df.to_csv(file_path, index=False)
+                    # Stream rows straight to the file
+                    items = self.scraped_data if isinstance(self.scraped_data, list) else [self.scraped_data]
+                    writer = CSVStreamWriter(file_path, fieldnames=['Data'])
+                    try:
+                        for item in items:
+                            writer.write({'Data': item})
+                    finally:
+                        writer.close()
                 else:  # JSON
                     with open(file_path, 'w', encoding='utf-8') as f:
                         json.dump(self.scraped_data, f, indent=4)